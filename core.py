@@ -1,7 +1,6 @@
 # ===========================================
 # IMPORT LIBRARY
 # ===========================================
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -9,19 +8,50 @@ from matplotlib.gridspec import GridSpec
 import warnings
 warnings.filterwarnings('ignore')
 
-from ta.trend import EMAIndicator, MACD
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
+from market_data import TickerData, PriceStore, FundamentalsCache, IndicatorStateStore, download
+from price_action import detect_swings, extract_zones, classify_structure
+from fundamentals import raw_fundamentals, fundamental_table, score_fundamentals, fundamental_result
+from valuation import valuation_inputs, score_valuation, VALUATION_COLUMNS
+from recommendation import (
+    recommendation_inputs, recommend_batch, recommendation_result,
+    DEFAULT_RISK_PER_TRADE_PCT, MIN_RISK_REWARD
+)
+from indicators import indicator_set, IndicatorState, tail_levels, tail_mean, WEEK_WINDOWS
+from timings import StageTimings, timed, record_rows
+
+# Store harga & cache fundamental bersama;
+# kirim None ke StockAnalyzer untuk menonaktifkan
+DEFAULT_PRICE_STORE = PriceStore()
+DEFAULT_INDICATOR_STORE = IndicatorStateStore()
+DEFAULT_FUNDAMENTALS_CACHE = FundamentalsCache()
 
 # ===========================================
 # SETUP UTAMA
 # ===========================================
 class StockAnalyzer:
-    def __init__(self, ticker="ANTM.JK", period="3mo", interval="1d"):
+    def __init__(self, ticker="ANTM.JK", period="3mo", interval="1d", price_data=None,
+                 price_store=DEFAULT_PRICE_STORE, fundamentals_cache=DEFAULT_FUNDAMENTALS_CACHE,
+                 ticker_data=None, indicator_state=None, incremental=False):
         self.ticker = ticker
         self.period = period
         self.interval = interval
+        # OHLCV hasil batch download (opsional), lihat market_data.download_ohlcv_batch
+        self.price_data = price_data
+        # Store OHLCV lokal, dibaca sebelum download ke Yahoo
+        self.price_store = price_store
+        # Data Yahoo (info & laporan keuangan) diambil sekali per analisis,
+        # atau TickerData.from_snapshot dari tahap I/O pipeline
+        self.data = ticker_data or TickerData(ticker, fundamentals_cache=fundamentals_cache)
         self.df = None
+        # Urutan lengkap HH/LH/HL/LL (structured array, lihat price_action.STRUCTURE_DTYPE)
+        self.structure = None
+        # State indikator inkremental (lihat indicators.IndicatorState);
+        # incremental=True: technical_analysis melanjutkan state ini dengan bar baru
+        # saja dan hanya mengisi indikator bar terakhir di self.df
+        self.indicator_state = indicator_state
+        self.incremental = incremental
+        # Waktu, network, bytes & baris per tahap (lihat timings.StageTimings)
+        self.timings = StageTimings()
         self.stock_info = None
         self.results = {
             "code": "...",
@@ -67,12 +97,13 @@ class StockAnalyzer:
         else:
             return "Kecil"
             
+    @timed("info")
     def info(self):
         # pastikan struktur dasar ada
         self.results.setdefault("info", {})
     
-        ticker = yf.Ticker(self.ticker)
-        info = ticker.info or {}
+        info = self.data.info
+        self.stock_info = info
     
         self.results["code"] = info.get("symbol", self.ticker)
     
@@ -122,23 +153,29 @@ class StockAnalyzer:
     # ===========================================
     # 1. TEKNIKAL ANALYSIS
     # ===========================================
+    @timed("technical")
     def technical_analysis(self):
         """Analisis teknikal dengan indikator tradisional"""
         #print("📊 MENGAMBIL DATA TEKNIKAL...")
         
-        # Download data
-        self.df = yf.download(
-            self.ticker,
-            period=self.period,
-            interval=self.interval,
-            progress=False
-        )
+        # Download data (pakai hasil batch / store lokal jika tersedia)
+        if self.price_data is not None and not self.price_data.empty:
+            self.df = self.price_data.copy()
+        elif self.price_store is not None:
+            self.df = self.price_store.get(self.ticker, self.period, self.interval)
+        else:
+            self.df = download(
+                self.ticker,
+                period=self.period,
+                interval=self.interval
+            )
         
         # Fix column names if MultiIndex
         if isinstance(self.df.columns, pd.MultiIndex):
             self.df.columns = self.df.columns.get_level_values(0)
         
         self.df.dropna(inplace=True)
+        record_rows(len(self.df))
         
         # Pastikan data 1 dimensi
         def to_series(col):
@@ -150,24 +187,39 @@ class StockAnalyzer:
         high = to_series(self.df["High"])
         low = to_series(self.df["Low"])
         
-        # Indikator Teknikal
-        self.df["EMA_5"] = EMAIndicator(close, window=5).ema_indicator()
-        self.df["EMA_9"] = EMAIndicator(close, window=9).ema_indicator()
-        self.df["EMA_20"] = EMAIndicator(close, window=20).ema_indicator()
-        self.df["EMA_50"] = EMAIndicator(close, window=50).ema_indicator()
+        if self.incremental:
+            # Lanjutkan state tersimpan dengan bar baru saja; putar ulang penuh
+            # saat cold start, jendela period bergeser, atau riwayat harga
+            # berubah (split/dividen) agar hasil sama dengan hitung ulang penuh
+            state = None
+            if self.indicator_state is not None:
+                state = self.indicator_state.resume(self.df.index, close, high, low)
+            if state is None:
+                state = IndicatorState.from_history(close, high, low, dates=self.df.index)
+            self.indicator_state = state
+            
+            values = state.snapshot()
+            support = values.pop("support")
+            resistance = values.pop("resistance")
+            self.df.loc[self.df.index[-1], list(values)] = list(values.values())
+            
+            return self._technical_summary(self.df.iloc[-1], support, resistance)
         
-        self.df["RSI"] = RSIIndicator(close, window=14).rsi()
+        # Indikator Teknikal (EMA 5/9/20/50, RSI, MACD, Bollinger dalam satu pass)
+        for name, values in indicator_set(close.to_numpy()).items():
+            self.df[name] = values
         
-        macd = MACD(close)
-        self.df["MACD"] = macd.macd()
-        self.df["MACD_SIGNAL"] = macd.macd_signal()
+        # State inkremental dibangun saat dibutuhkan (update_technical)
+        self.indicator_state = None
         
-        bb = BollingerBands(close)
-        self.df["BB_UPPER"] = bb.bollinger_hband()
-        self.df["BB_LOWER"] = bb.bollinger_lband()
+        # Support & Resistance (min/max 10 & 30 bar terakhir)
+        support, resistance = tail_levels(high.to_numpy(), low.to_numpy(), [10, 30])
         
+        return self._technical_summary(self.df.iloc[-1], support, resistance)
+    
+    def _technical_summary(self, latest, support, resistance):
+        """Trend, momentum, signal & trading plan dari bar terakhir"""
         # Analisis
-        latest = self.df.iloc[-1]
         close_price = float(latest["Close"])
         ema20 = float(latest["EMA_20"])
         ema50 = float(latest["EMA_50"])
@@ -191,11 +243,8 @@ class StockAnalyzer:
         else:
             momentum = "NETRAL"
         
-        # Support & Resistance
-        support_1 = low.rolling(window=10).min().iloc[-1]
-        resistance_1 = high.rolling(window=10).max().iloc[-1]
-        support_2 = low.rolling(window=30).min().iloc[-1]
-        resistance_2 = high.rolling(window=30).max().iloc[-1]
+        support_1, support_2 = support
+        resistance_1, resistance_2 = resistance
         
         # Entry Signal
         signal = "NO TRADE"
@@ -235,9 +284,91 @@ class StockAnalyzer:
         
         return self.results['technical']
     
+    def update_technical(self, bar, date=None):
+        """
+        Perbarui analisis teknikal dengan satu bar baru tanpa menghitung ulang
+        seluruh riwayat indikator (O(1) per bar lewat IndicatorState).
+
+        bar  : dict/Series berisi High, Low, Close (Open & Volume opsional)
+        date : tanggal bar; wajib untuk dict (Series memakai bar.name).
+               Jika sama dengan bar terakhir, bar terakhir diganti (candle
+               yang belum selesai).
+
+        Bagian lain yang memakai harga terakhir (price_action, valuation,
+        trading_recommendation) dihitung ulang jika sudah pernah dijalankan.
+        Fundamental tidak berubah.
+        """
+        if self.df is None:
+            return self.technical_analysis()
+        
+        date = date if date is not None else getattr(bar, "name", None)
+        if date is None:
+            raise ValueError("Tanggal bar wajib diisi (argumen date atau Series.name)")
+        date = pd.Timestamp(date)
+        if self.df.index.tz is not None and date.tz is None:
+            date = date.tz_localize(self.df.index.tz)
+        
+        last = self.df.index[-1] if len(self.df) else None
+        if last is not None and date < last:
+            raise ValueError(f"Bar {date} lebih lama dari bar terakhir {last}")
+        replace_last = last is not None and date == last
+        
+        # Validasi isi bar sebelum df / state diubah
+        row = {col: float(bar[col]) for col in ["High", "Low", "Close"]}
+        row.update({col: float(bar[col]) for col in ["Open", "Volume"] if col in bar})
+        
+        # Cold start (analisis penuh sebelumnya): state dari riwayat sebelum bar ini
+        state = self.indicator_state
+        if state is None or (replace_last and state._previous is None):
+            history = self.df.iloc[:-1] if replace_last else self.df
+            state = IndicatorState.from_history(
+                history["Close"], history["High"], history["Low"], dates=history.index
+            )
+            replace_last = False
+        
+        # Tambahkan bar ke df dulu, baru state dimajukan
+        self.df.loc[date, list(row)] = list(row.values())
+        values = state.update(row["Close"], row["High"], row["Low"], replace_last=replace_last, date=date)
+        self.indicator_state = state
+        
+        support = values.pop("support")
+        resistance = values.pop("resistance")
+        self.df.loc[date, list(values)] = list(values.values())
+        
+        technical = self._technical_summary(self.df.iloc[-1], support, resistance)
+        
+        if "price_action" in self.results:
+            self.price_action_analysis()
+        if "valuation" in self.results:
+            self.valuation_analysis()
+        if "trading_recommendation" in self.results:
+            self.trading_recommendation()
+        
+        return technical
+    
+    def price_levels(self, windows=WEEK_WINDOWS):
+        """
+        Rentang harga (low/high) untuk beberapa jendela sekaligus, mis.
+        {"10w": 50, "30w": 150, "52w": 252} bar. Dihitung dari ekor data
+        dalam satu pass. Return {nama: {"low": ..., "high": ...}}.
+        """
+        if self.df is None:
+            return {}
+        
+        support, resistance = tail_levels(
+            self.df["High"].to_numpy(),
+            self.df["Low"].to_numpy(),
+            dict(windows)
+        )
+        return {
+            name: {"low": support[name], "high": resistance[name]}
+            for name in windows
+        }
+    
     # ===========================================
     # 2. PRICE ACTION ANALYSIS
     # ===========================================
+    @timed("price_action")
     def price_action_analysis(self, swing_window=3, impulse_factor=1.5):
         """Analisis struktur pasar dan supply/demand zones"""
         #print("📈 ANALISIS PRICE ACTION...")
@@ -247,72 +378,33 @@ class StockAnalyzer:
             return None
         
         df = self.df.copy()
+        record_rows(len(df))
         
-        # Deteksi Swing High/Low
-        df["SWING_HIGH"] = (
-            df["High"]
-            .rolling(swing_window*2+1, center=True)
-            .apply(lambda x: x[swing_window] == max(x), raw=True)
+        # Deteksi Swing High/Low (sliding window NumPy)
+        df["SWING_HIGH"], df["SWING_LOW"] = detect_swings(
+            df["High"].to_numpy(),
+            df["Low"].to_numpy(),
+            swing_window
         )
         
-        df["SWING_LOW"] = (
-            df["Low"]
-            .rolling(swing_window*2+1, center=True)
-            .apply(lambda x: x[swing_window] == min(x), raw=True)
+        # Market Structure (HH/LH/HL/LL dari swing point saja)
+        self.structure = classify_structure(
+            df["High"].to_numpy(),
+            df["Low"].to_numpy(),
+            df["SWING_HIGH"].to_numpy(),
+            df["SWING_LOW"].to_numpy()
         )
         
-        # Market Structure
-        structure = []
-        last_high = None
-        last_low = None
-        
-        for i in range(len(df)):
-            if df["SWING_HIGH"].iloc[i]:
-                high = df["High"].iloc[i]
-                if last_high is not None:
-                    structure.append(("HH" if high > last_high else "LH", df.index[i], high))
-                last_high = high
-            
-            if df["SWING_LOW"].iloc[i]:
-                low = df["Low"].iloc[i]
-                if last_low is not None:
-                    structure.append(("HL" if low > last_low else "LL", df.index[i], low))
-                last_low = low
-        
-        # Supply/Demand Zones
-        zones = []
-        for i in range(1, len(df)):
-            body = abs(df["Close"].iloc[i] - df["Open"].iloc[i])
-            prev_body = abs(df["Close"].iloc[i-1] - df["Open"].iloc[i-1])
-            
-            if prev_body == 0:
-                continue
-            
-            # Impulse Up → Demand Zone
-            if body > impulse_factor * prev_body and df["Close"].iloc[i] > df["Open"].iloc[i]:
-                zones.append({
-                    "type": "DEMAND",
-                    "low": df["Low"].iloc[i-1],
-                    "high": df["Open"].iloc[i-1],
-                    "date": df.index[i]
-                })
-            
-            # Impulse Down → Supply Zone
-            if body > impulse_factor * prev_body and df["Close"].iloc[i] < df["Open"].iloc[i]:
-                zones.append({
-                    "type": "SUPPLY",
-                    "low": df["Open"].iloc[i-1],
-                    "high": df["High"].iloc[i-1],
-                    "date": df.index[i]
-                })
+        # Supply/Demand Zones (hanya 5 zone terakhir yang disimpan)
+        zones, total_zones = extract_zones(df, impulse_factor, last=5)
         
         # Simpan hasil
-        market_structure = structure[-1][0] if structure else "TIDAK TERDETEKSI"
+        market_structure = str(self.structure["code"][-1]) if len(self.structure) else "TIDAK TERDETEKSI"
         
         self.results['price_action'] = {
             'market_structure': market_structure,
-            'zones': zones[-5:],  # 5 zone terakhir
-            'total_zones': len(zones)
+            'zones': zones,  # 5 zone terakhir
+            'total_zones': total_zones
         }
         
         return self.results['price_action']
@@ -320,159 +412,32 @@ class StockAnalyzer:
     # ===========================================
     # 3. FUNDAMENTAL ANALYSIS (FIXED)
     # ===========================================
+    @timed("fundamental")
     def fundamental_analysis(self):
         """Analisis fundamental dengan berbagai metrik"""
         #print("📋 ANALISIS FUNDAMENTAL...")
         
         try:
-            stock = yf.Ticker(self.ticker)
-            self.stock_info = stock.info
+            self.stock_info = self.data.info
             
             # Data keuangan
-            self.financials = stock.financials
-            self.balance = stock.balance_sheet
-            self.cashflow = stock.cashflow
-            
-            # Helper function
-            def safe_get(df, key):
-                try:
-                    if isinstance(df, pd.DataFrame) and key in df.index:
-                        # Ambil nilai terbaru (index pertama adalah terbaru)
-                        value = df.loc[key]
-                        if isinstance(value, pd.Series):
-                            return value.iloc[0] if len(value) > 0 else None
-                        return value
-                    elif isinstance(df, dict):
-                        return df.get(key)
-                    return None
-                except:
-                    return None
-            
-            # Extract data - gunakan try-except untuk setiap nilai
-            net_income = safe_get(self.financials, "Net Income") if self.financials is not None else None
-            total_assets = safe_get(self.balance, "Total Assets") if self.balance is not None else None
-            total_equity = safe_get(self.balance, "Total Stockholder Equity") if self.balance is not None else None
-            total_debt = safe_get(self.balance, "Total Debt") if self.balance is not None else None
-            operating_cf = safe_get(self.cashflow, "Total Cash From Operating Activities") if self.cashflow is not None else None
-            revenue = safe_get(self.financials, "Total Revenue") if self.financials is not None else None
-            
-            # Konversi ke float jika ada
-            def to_float(value):
-                if value is None:
-                    return None
-                try:
-                    return float(value)
-                except:
-                    return None
-            
-            net_income_f = to_float(net_income)
-            total_assets_f = to_float(total_assets)
-            total_equity_f = to_float(total_equity)
-            total_debt_f = to_float(total_debt)
-            operating_cf_f = to_float(operating_cf)
-            revenue_f = to_float(revenue)
-            
-            # Rasio (dengan pengecekan division by zero)
-            roe = (net_income_f / total_equity_f * 100) if net_income_f and total_equity_f and total_equity_f != 0 else None
-            roa = (net_income_f / total_assets_f * 100) if net_income_f and total_assets_f and total_assets_f != 0 else None
-            npm = (net_income_f / revenue_f * 100) if net_income_f and revenue_f and revenue_f != 0 else None
-            der = (total_debt_f / total_equity_f) if total_debt_f and total_equity_f and total_equity_f != 0 else None
-            
-            # Valuation
-            pe = to_float(self.stock_info.get("trailingPE"))
-            pb = to_float(self.stock_info.get("priceToBook"))
-            
-            # Growth (Quarterly) - FIXED: handle series properly
-            quarterly_income = stock.quarterly_financials
-            quarterly_cf = stock.quarterly_cashflow
-            
-            # Helper untuk mendapatkan series dengan benar
-            def get_quarterly_series(data, key):
-                if data is None or key not in data.index:
-                    return None
-                series = data.loc[key]
-                if isinstance(series, pd.Series):
-                    # Sort dari yang terlama ke terbaru
-                    return series.sort_index(ascending=True)
-                return None
-            
-            # Get series untuk growth calculation
-            rev_series = get_quarterly_series(quarterly_income, "Total Revenue")
-            ni_series = get_quarterly_series(quarterly_income, "Net Income")
-            
-            # Helper untuk calculate growth - FIXED: tidak pakai len() di float
-            def calculate_growth(series):
-                if series is None or not isinstance(series, pd.Series):
-                    return None, None
-                
-                if len(series) < 2:
-                    return None, None
-                
-                try:
-                    # QoQ growth (quarter to quarter)
-                    last_val = series.iloc[-1]
-                    prev_val = series.iloc[-2]
-                    qoq = ((last_val - prev_val) / abs(prev_val) * 100) if prev_val != 0 else None
-                    
-                    # YoY growth (year over year)
-                    yoy = None
-                    if len(series) >= 4:
-                        year_ago_val = series.iloc[-4]
-                        yoy = ((last_val - year_ago_val) / abs(year_ago_val) * 100) if year_ago_val != 0 else None
-                    
-                    return yoy, qoq
-                except:
-                    return None, None
-            
-            rev_yoy, rev_qoq = calculate_growth(rev_series)
-            ni_yoy, ni_qoq = calculate_growth(ni_series)
-            
-            # Fundamental Score
-            score = 0
-            
-            # Profitability (50 points)
-            if roe and roe > 15: score += 20
-            if roa and roa > 5: score += 15
-            if npm and npm > 10: score += 15
-            
-            # Leverage (20 points)
-            if der and der < 1.5: score += 10
-            if der and der < 1: score += 10
-            
-            # Growth (20 points)
-            if rev_yoy and rev_yoy > 10: score += 10
-            if ni_yoy and ni_yoy > 10: score += 10
-            
-            # Valuation (10 points)
-            if pb and pb < 2: score += 10
-            
-            # Cap score maksimal 100
-            score = min(score, 100)
-            
-            # Interpretasi Score
-            if score >= 80:
-                rating = "SANGAT KUAT 🟢"
-            elif score >= 60:
-                rating = "CUKUP KUAT 🟡"
-            elif score >= 40:
-                rating = "LEMAH 🟠"
-            else:
-                rating = "BURUK 🔴"
+            self.financials = self.data.financials
+            self.balance = self.data.balance_sheet
+            self.cashflow = self.data.cashflow
+            
+            # Field mentah → rasio, growth dan score (engine yang sama dengan screening batch)
+            statements = {
+                "financials": self.financials,
+                "balance_sheet": self.balance,
+                "cashflow": self.cashflow,
+                "quarterly_financials": self.data.quarterly_financials,
+            }
+            record_rows(sum(len(df) for df in statements.values() if isinstance(df, pd.DataFrame)))
+            table = fundamental_table({self.ticker: raw_fundamentals(statements, self.stock_info)})
+            scored = score_fundamentals(table)
             
             # Simpan hasil
-            self.results['fundamental'] = {
-                'roe': roe,
-                'roa': roa,
-                'npm': npm,
-                'der': der,
-                'pe': pe,
-                'pb': pb,
-                'revenue_growth': {'yoy': rev_yoy, 'qoq': rev_qoq},
-                'netincome_growth': {'yoy': ni_yoy, 'qoq': ni_qoq},
-                'operating_cf': operating_cf_f,
-                'score': score,
-                'rating': rating
-            }
+            self.results['fundamental'] = fundamental_result(scored.iloc[0])
             
             return self.results['fundamental']
             
@@ -500,14 +465,14 @@ class StockAnalyzer:
     # ===========================================
     # 4. ANALISIS VALUASI (BARU)
     # ===========================================
+    @timed("valuation")
     def valuation_analysis(self):
         """Analisis apakah harga saham mahal atau murah relatif terhadap nilai aset dan kinerja"""
         #print("💰 ANALISIS VALUASI...")
         
         if self.stock_info is None:
             try:
-                stock = yf.Ticker(self.ticker)
-                self.stock_info = stock.info
+                self.stock_info = self.data.info
             except:
                 print("⚠️ Tidak bisa mendapatkan data valuasi")
                 return None
@@ -522,44 +487,18 @@ class StockAnalyzer:
             # Ambil data fundamental
             fund = self.results.get('fundamental', {})
             
-            # Data dari yfinance
-            info = self.stock_info
-            
-            # Helper function
-            def safe_get(key, default=None):
-                value = info.get(key, default)
-                if value is None or value == 0:
-                    return default
-                return float(value)
-            
-            # 1. PER Analysis
-            trailing_pe = safe_get('trailingPE')
-            forward_pe = safe_get('forwardPE')
-            pe_ratio = trailing_pe if trailing_pe else forward_pe
-            
-            # 2. PBV Analysis
-            pb_ratio = safe_get('priceToBook')
-            
-            # 3. Dividend Yield
-            dividend_yield = safe_get('dividendYield')
-            if dividend_yield:
-                dividend_yield = dividend_yield * 100  # Convert to percentage
-            
-            # 4. EV/EBITDA
-            ev_to_ebitda = safe_get('enterpriseToEbitda')
-            
-            # 5. PEG Ratio (Price/Earnings to Growth)
-            peg_ratio = safe_get('pegRatio')
-            
-            # 6. Price/Sales
-            ps_ratio = safe_get('priceToSalesTrailing12Months')
+            # Rasio valuasi dari yfinance (PER, PBV, dividend yield, EV/EBITDA, PEG, P/S)
+            inputs = valuation_inputs(self.stock_info)
+            pe_ratio = inputs['pe_ratio']
             
             # 7. Historical Price Analysis
             historical_analysis = {}
             if self.df is not None:
                 # Rentang harga 52 minggu
-                week_52_high = self.df['High'].rolling(window=252).max().iloc[-1] if len(self.df) >= 252 else None
-                week_52_low = self.df['Low'].rolling(window=252).min().iloc[-1] if len(self.df) >= 252 else None
+                week_52_high = week_52_low = None
+                if len(self.df) >= 252:
+                    levels = self.price_levels({"52w": 252})["52w"]
+                    week_52_high, week_52_low = levels["high"], levels["low"]
                 
                 if week_52_high and week_52_low and current_price:
                     # Posisi relatif dalam rentang 52 minggu
@@ -569,14 +508,14 @@ class StockAnalyzer:
                     historical_analysis['week_52_low'] = week_52_low
                 
                 # Analisis rata-rata bergerak
-                ma_200 = self.df['Close'].rolling(window=200).mean().iloc[-1] if len(self.df) >= 200 else None
+                ma_200 = tail_mean(self.df['Close'], 200) if len(self.df) >= 200 else None
                 if ma_200 and current_price:
                     price_vs_ma200 = (current_price / ma_200 - 1) * 100
                     historical_analysis['ma_200'] = ma_200
                     historical_analysis['price_vs_ma200_pct'] = price_vs_ma200
             
             # 8. Industry Comparison (estimasi sederhana)
-            industry_pe = safe_get('industryPE', 15)  # Default 15 jika tidak ada data
+            industry_pe = inputs['industry_pe']  # Default 15 jika tidak ada data
             
             # 9. Intrinsic Value Estimation (simplified)
             intrinsic_value = None
@@ -587,99 +526,9 @@ class StockAnalyzer:
                 if eps and growth_rate:
                     intrinsic_value = eps * (8.5 + 2 * min(growth_rate/100, 0.2))  # Growth max 20%
             
-            # 10. Valuation Score
-            valuation_score = 0
-            valuation_notes = []
-            
-            # PER Score
-            if pe_ratio:
-                if pe_ratio < 10:
-                    valuation_score += 20
-                    valuation_notes.append("✅ PER sangat rendah (murah)")
-                elif pe_ratio < 15:
-                    valuation_score += 15
-                    valuation_notes.append("✅ PER rendah")
-                elif pe_ratio < industry_pe:
-                    valuation_score += 10
-                    valuation_notes.append("✅ PER di bawah rata-rata industri")
-                elif pe_ratio < 25:
-                    valuation_score += 5
-                    valuation_notes.append("⚠️ PER sedang")
-                else:
-                    valuation_score += 0
-                    valuation_notes.append("❌ PER tinggi (mahal)")
-            
-            # PBV Score
-            if pb_ratio:
-                if pb_ratio < 1:
-                    valuation_score += 20
-                    valuation_notes.append("✅ Harga di bawah nilai buku (murah)")
-                elif pb_ratio < 1.5:
-                    valuation_score += 15
-                    valuation_notes.append("✅ PBV rendah")
-                elif pb_ratio < 2:
-                    valuation_score += 10
-                    valuation_notes.append("✅ PBV wajar")
-                elif pb_ratio < 3:
-                    valuation_score += 5
-                    valuation_notes.append("⚠️ PBV agak tinggi")
-                else:
-                    valuation_score += 0
-                    valuation_notes.append("❌ PBV sangat tinggi")
-            
-            # Dividend Yield Score
-            if dividend_yield:
-                if dividend_yield > 5:
-                    valuation_score += 15
-                    valuation_notes.append("✅ Dividend yield tinggi")
-                elif dividend_yield > 3:
-                    valuation_score += 10
-                    valuation_notes.append("✅ Dividend yield baik")
-                elif dividend_yield > 1.5:
-                    valuation_score += 5
-                    valuation_notes.append("⚠️ Dividend yield cukup")
-            
-            # PEG Ratio Score
-            if peg_ratio:
-                if peg_ratio < 0.5:
-                    valuation_score += 15
-                    valuation_notes.append("✅ PEG sangat rendah (sangat murah)")
-                elif peg_ratio < 1:
-                    valuation_score += 10
-                    valuation_notes.append("✅ PEG rendah (murah)")
-                elif peg_ratio < 1.5:
-                    valuation_score += 5
-                    valuation_notes.append("⚠️ PEG wajar")
-                else:
-                    valuation_score += 0
-                    valuation_notes.append("❌ PEG tinggi (mahal)")
-            
-            # Historical Price Score
-            if 'week_52_position' in historical_analysis:
-                position = historical_analysis['week_52_position']
-                if position < 30:
-                    valuation_score += 15
-                    valuation_notes.append("✅ Posisi di bawah 30% rentang 52 minggu (murah)")
-                elif position < 50:
-                    valuation_score += 10
-                    valuation_notes.append("✅ Posisi di bawah tengah rentang 52 minggu")
-                elif position > 70:
-                    valuation_score += 0
-                    valuation_notes.append("❌ Posisi di atas 70% rentang 52 minggu (mahal)")
-            
-            # Cap maksimal score
-            valuation_score = min(valuation_score, 100)
-            
-            # Kesimpulan Valuasi
-            if valuation_score >= 60:
-                valuation_conclusion = "SAHAM MURAH 🟢"
-                valuation_reason = "Berbagai indikator valuasi menunjukkan harga relatif murah"
-            elif valuation_score >= 40:
-                valuation_conclusion = "SAHAM WAJAR 🟡"
-                valuation_reason = "Harga dalam kisaran wajar berdasarkan valuasi"
-            else:
-                valuation_conclusion = "SAHAM MAHAL 🔴"
-                valuation_reason = "Berbagai indikator valuasi menunjukkan harga relatif mahal"
+            # 10. Valuation Score (aturan di valuation.VALUATION_RULES)
+            inputs['week_52_position'] = historical_analysis.get('week_52_position')
+            verdict = score_valuation(pd.DataFrame([inputs], columns=VALUATION_COLUMNS).astype(float)).iloc[0]
             
             # Margin of Safety
             margin_of_safety = None
@@ -690,19 +539,19 @@ class StockAnalyzer:
             self.results['valuation'] = {
                 'current_price': current_price,
                 'pe_ratio': pe_ratio,
-                'pb_ratio': pb_ratio,
-                'dividend_yield': dividend_yield,
-                'ev_ebitda': ev_to_ebitda,
-                'peg_ratio': peg_ratio,
-                'ps_ratio': ps_ratio,
+                'pb_ratio': inputs['pb_ratio'],
+                'dividend_yield': inputs['dividend_yield'],
+                'ev_ebitda': inputs['ev_ebitda'],
+                'peg_ratio': inputs['peg_ratio'],
+                'ps_ratio': inputs['ps_ratio'],
                 'industry_pe': industry_pe,
                 'historical_analysis': historical_analysis,
                 'intrinsic_value': intrinsic_value,
                 'margin_of_safety': margin_of_safety,
-                'valuation_score': valuation_score,
-                'valuation_conclusion': valuation_conclusion,
-                'valuation_reason': valuation_reason,
-                'valuation_notes': valuation_notes
+                'valuation_score': int(verdict['valuation_score']),
+                'valuation_conclusion': str(verdict['valuation_conclusion']),
+                'valuation_reason': str(verdict['valuation_reason']),
+                'valuation_notes': list(verdict['valuation_notes'])
             }
             
             return self.results['valuation']
@@ -1223,10 +1072,13 @@ class StockAnalyzer:
     # ===========================================
     # 8. REKOMENDASI OTOMATIS (DIPERBARUI)
     # ===========================================
-    def trading_recommendation(self, risk_per_trade_pct=2):
+    @timed("recommendation")
+    def trading_recommendation(self, risk_per_trade_pct=DEFAULT_RISK_PER_TRADE_PCT, min_rr=MIN_RISK_REWARD):
         """
         Membuat rencana & rekomendasi trading lengkap
         risk_per_trade_pct : % maksimal risiko per trade (default 2%)
+        min_rr             : RR minimum ke TP1 agar layak (default 2)
+        Aturan yang sama dipakai recommendation.recommend_batch untuk seluruh universe.
         """
     
         # ======================================================
@@ -1241,8 +1093,6 @@ class StockAnalyzer:
         # ======================================================
         tech = self.results.get("technical")
         pa = self.results.get("price_action")
-        info = self.results.get("info", {})
-        valuation = self.results.get("valuation", {})
     
         # ======================================================
         # VALIDASI DATA WAJIB
@@ -1253,107 +1103,13 @@ class StockAnalyzer:
                 "reason": "Data teknikal atau price action belum tersedia"
             })
     
-        signal = tech.get("signal")
-        trend = tech.get("trend")
-        close = tech.get("close")
-    
-        if signal == "NO TRADE":
-            return finalize({
-                "status": "WAIT",
-                "reason": "Tidak ada sinyal teknikal yang valid"
-            })
-    
-        # ======================================================
-        # ENTRY, SL, TP
-        # ======================================================
-        plan = tech.get("trading_plan", {})
-    
-        entry = plan.get("entry")
-        sl = plan.get("sl")
-        tp1 = plan.get("tp1")
-        tp2 = plan.get("tp2")
-    
-        if not all([entry, sl, tp1]):
-            return finalize({
-                "status": "WAIT",
-                "reason": "Trading plan tidak lengkap"
-            })
-    
         # ======================================================
-        # RISK & REWARD
+        # ENTRY, SL, TP, RISK & REWARD, CATATAN
         # ======================================================
-        risk = abs(entry - sl)
+        table = pd.DataFrame([recommendation_inputs(self.results)], index=[self.ticker])
+        row = recommend_batch(table, risk_per_trade_pct, min_rr).iloc[0]
     
-        if risk == 0:
-            return finalize({
-                "status": "WAIT",
-                "reason": "Risk per share = 0 (entry & SL sama)"
-            })
-    
-        reward_1 = abs(tp1 - entry)
-        reward_2 = abs(tp2 - entry) if tp2 else None
-    
-        rr1 = reward_1 / risk
-        rr2 = reward_2 / risk if reward_2 else None
-    
-        # ======================================================
-        # FILTER KUALITAS
-        # ======================================================
-        category = info.get("category")
-    
-        quality_note = (
-            "⚠️ Saham kategori kecil, risiko likuiditas lebih tinggi"
-            if category == "Kecil"
-            else "Likuiditas relatif aman"
-        )
-    
-        if rr1 < 2:
-            return finalize({
-                "status": "WAIT",
-                "reason": f"Risk reward tidak ideal (RR {rr1:.2f})"
-            })
-    
-        # ======================================================
-        # KONTEKS VALUASI
-        # ======================================================
-        valuation_view = valuation.get("valuation_conclusion", "TIDAK DINILAI")
-    
-        bias_note = (
-            "⚠️ Secara valuasi saham tergolong mahal"
-            if valuation_view == "SAHAM MAHAL 🔴" and signal == "BUY"
-            else "Valuasi tidak menjadi hambatan utama"
-        )
-    
-        # ======================================================
-        # REKOMENDASI FINAL
-        # ======================================================
-        recommendation = {
-            "status": "LAYAK DITRADINGKAN",
-            "signal": signal,
-            "trend": trend,
-            "entry_price": entry,
-            "stop_loss": sl,
-            "take_profit": {
-                "tp1": tp1,
-                "tp2": tp2
-            },
-            "risk_per_share": round(risk, 2),
-            "reward": {
-                "rr_tp1": round(rr1, 2),
-                "rr_tp2": round(rr2, 2) if rr2 else None
-            },
-            "risk_management": {
-                "max_risk_pct": risk_per_trade_pct,
-                "rule": f"Maksimal risiko {risk_per_trade_pct}% dari modal"
-            },
-            "notes": [
-                quality_note,
-                bias_note,
-                f"Market Structure: {pa.get('market_structure')}"
-            ]
-        }
-    
-        return finalize(recommendation)
+        return finalize(recommendation_result(row, tech.get("signal"), tech.get("trend")))
 
 
     # ===========================================
@@ -1426,7 +1182,29 @@ class StockAnalyzer:
         print("=" * 60 + "\n")
 
 
-    
-
+# ===========================================
+# MAIN EXECUTION
+# ===========================================
+def run_analysis(ticker="ANTM.JK", period="3mo", interval="1d", price_data=None, **kwargs):
+    """
+    Jalankan analisis lengkap satu saham dan kembalikan analyzer-nya.
+    Aman dipanggil dari worker thread/proses (tidak bergantung pada Streamlit).
+    kwargs diteruskan ke StockAnalyzer (price_store, fundamentals_cache, ticker_data,
+    indicator_state, incremental).
+    """
+    analyzer = StockAnalyzer(
+        ticker=ticker,
+        period=period,
+        interval=interval,
+        price_data=price_data,
+        **kwargs
+    )
 
+    analyzer.info()
+    analyzer.technical_analysis()
+    analyzer.price_action_analysis()
+    analyzer.fundamental_analysis()
+    analyzer.valuation_analysis()
+    analyzer.trading_recommendation()
 
+    return analyzer
@@ -0,0 +1,257 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import numpy as np
+import pandas as pd
+
+
+# ===========================================
+# FIELD MENTAH DARI LAPORAN KEUANGAN
+# ===========================================
+# field tabel → (laporan, baris laporan)
+STATEMENT_FIELDS = {
+    "net_income": ("financials", "Net Income"),
+    "total_assets": ("balance_sheet", "Total Assets"),
+    "total_equity": ("balance_sheet", "Total Stockholder Equity"),
+    "total_debt": ("balance_sheet", "Total Debt"),
+    "operating_cf": ("cashflow", "Total Cash From Operating Activities"),
+    "revenue": ("financials", "Total Revenue"),
+}
+
+# field tabel → key di Ticker.info
+INFO_FIELDS = {
+    "pe": "trailingPE",
+    "pb": "priceToBook",
+}
+
+# prefix tabel → baris quarterly_financials untuk growth
+QUARTERLY_FIELDS = {
+    "revenue": "Total Revenue",
+    "netincome": "Net Income",
+}
+
+# laporan → baris yang dipakai analisis fundamental
+STATEMENT_ROWS = {}
+for _name, _key in STATEMENT_FIELDS.values():
+    STATEMENT_ROWS.setdefault(_name, []).append(_key)
+STATEMENT_ROWS["quarterly_financials"] = list(QUARTERLY_FIELDS.values())
+
+RAW_FIELDS = (
+    list(STATEMENT_FIELDS)
+    + list(INFO_FIELDS)
+    + [f"{prefix}_{lag}" for prefix in QUARTERLY_FIELDS for lag in ("q0", "q1", "q4")]
+)
+
+
+def _to_float(value):
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def statement_value(df, key):
+    """Nilai terbaru (kolom pertama) baris `key` dari laporan, NaN jika tidak ada"""
+    if not isinstance(df, pd.DataFrame) or key not in df.index:
+        return np.nan
+    value = df.loc[key]
+    if isinstance(value, pd.Series):
+        return _to_float(value.iloc[0]) if len(value) > 0 else np.nan
+    return _to_float(value)
+
+
+def quarterly_values(df, key):
+    """
+    Nilai kuartal terakhir (q0), sebelumnya (q1) dan setahun lalu (q4)
+    dari laporan kuartalan. NaN jika data tidak cukup.
+    """
+    if not isinstance(df, pd.DataFrame) or key not in df.index:
+        return np.nan, np.nan, np.nan
+
+    series = df.loc[key]
+    if not isinstance(series, pd.Series):
+        return np.nan, np.nan, np.nan
+
+    values = [_to_float(v) for v in series.sort_index(ascending=True).tolist()]
+    q0 = values[-1] if len(values) >= 2 else np.nan
+    q1 = values[-2] if len(values) >= 2 else np.nan
+    q4 = values[-4] if len(values) >= 4 else np.nan
+    return q0, q1, q4
+
+
+def compact_statements(statements, names):
+    """
+    Salinan ringkas dict laporan: hanya baris STATEMENT_ROWS yang dipakai
+    analisis. Semua `names` tetap ada (laporan tanpa baris terpakai → kosong).
+    """
+    compact = {}
+    for name in names:
+        df = statements.get(name)
+        if isinstance(df, pd.DataFrame):
+            df = df[df.index.isin(STATEMENT_ROWS.get(name, []))]
+        compact[name] = df
+    return compact
+
+
+def raw_fundamentals(statements, info=None):
+    """
+    Ambil field mentah satu saham dari dict laporan keuangan
+    ({"financials": df, ...}, lihat market_data.STATEMENTS) dan Ticker.info.
+    """
+    info = info or {}
+    row = {
+        field: statement_value(statements.get(name), key)
+        for field, (name, key) in STATEMENT_FIELDS.items()
+    }
+    row.update({field: _to_float(info.get(key)) for field, key in INFO_FIELDS.items()})
+
+    quarterly = statements.get("quarterly_financials")
+    for prefix, key in QUARTERLY_FIELDS.items():
+        row[f"{prefix}_q0"], row[f"{prefix}_q1"], row[f"{prefix}_q4"] = quarterly_values(quarterly, key)
+
+    return row
+
+
+def fundamental_table(raw):
+    """
+    Susun tabel field mentah (index = ticker, kolom = RAW_FIELDS) dari
+    dict {ticker: raw_fundamentals(...)}.
+    """
+    table = pd.DataFrame.from_dict(raw, orient="index")
+    return table.reindex(columns=RAW_FIELDS).astype(float)
+
+
+def cached_fundamental_table(tickers, fundamentals_cache, info=None):
+    """
+    Tabel field mentah dari isi FundamentalsCache di disk saja (tanpa request).
+    `info` opsional: dict {ticker: Ticker.info} untuk PER/PBV.
+    Ticker yang belum ada di cache dilewati.
+    """
+    info = info or {}
+    raw = {}
+    for ticker in tickers:
+        entry = fundamentals_cache.read(ticker)
+        if entry is None:
+            continue
+        raw[ticker] = raw_fundamentals(entry["statements"], info.get(ticker))
+    return fundamental_table(raw)
+
+
+# ===========================================
+# RASIO & GROWTH (VECTORIZED)
+# ===========================================
+def _ratio(numerator, denominator, scale=1.0):
+    # Sama seperti versi skalar: pembilang/penyebut 0 → kosong
+    valid = numerator.ne(0) & denominator.ne(0)
+    return (numerator / denominator * scale).where(valid)
+
+
+def _growth(current, base):
+    return ((current - base) / base.abs() * 100).where(base.ne(0))
+
+
+def fundamental_ratios(table):
+    """ROE/ROA/NPM/DER, PER/PBV dan growth YoY/QoQ untuk seluruh tabel"""
+    return pd.DataFrame({
+        "roe": _ratio(table["net_income"], table["total_equity"], 100),
+        "roa": _ratio(table["net_income"], table["total_assets"], 100),
+        "npm": _ratio(table["net_income"], table["revenue"], 100),
+        "der": _ratio(table["total_debt"], table["total_equity"]),
+        "pe": table["pe"],
+        "pb": table["pb"],
+        "revenue_yoy": _growth(table["revenue_q0"], table["revenue_q4"]),
+        "revenue_qoq": _growth(table["revenue_q0"], table["revenue_q1"]),
+        "netincome_yoy": _growth(table["netincome_q0"], table["netincome_q4"]),
+        "netincome_qoq": _growth(table["netincome_q0"], table["netincome_q1"]),
+        "operating_cf": table["operating_cf"],
+    }, index=table.index)
+
+
+# ===========================================
+# SCORE & RATING (VECTORIZED)
+# ===========================================
+# (kolom rasio, operator, ambang, poin)
+SCORE_RULES = [
+    # Profitability (50 poin)
+    ("roe", ">", 15, 20),
+    ("roa", ">", 5, 15),
+    ("npm", ">", 10, 15),
+    # Leverage (20 poin)
+    ("der", "<", 1.5, 10),
+    ("der", "<", 1, 10),
+    # Growth (20 poin)
+    ("revenue_yoy", ">", 10, 10),
+    ("netincome_yoy", ">", 10, 10),
+    # Valuation (10 poin)
+    ("pb", "<", 2, 10),
+]
+
+# (score minimum, rating), dicek dari atas
+RATING_BANDS = [
+    (80, "SANGAT KUAT 🟢"),
+    (60, "CUKUP KUAT 🟡"),
+    (40, "LEMAH 🟠"),
+]
+RATING_DEFAULT = "BURUK 🔴"
+
+MAX_SCORE = 100
+
+
+def rule_mask(values, op, threshold):
+    """Baris yang lolos aturan. Nilai kosong / 0 tidak dapat poin (seperti `if x and x > t`)."""
+    present = values.notna() & values.ne(0)
+    if op == ">":
+        passed = values.gt(threshold)
+    elif op == ">=":
+        passed = values.ge(threshold)
+    elif op == "<":
+        passed = values.lt(threshold)
+    elif op == "<=":
+        passed = values.le(threshold)
+    else:
+        raise ValueError(f"Operator tidak dikenal: {op}")
+    return present & passed
+
+
+def fundamental_scores(ratios, rules=SCORE_RULES, bands=RATING_BANDS, default=RATING_DEFAULT):
+    """Tambahkan kolom `score` dan `rating` ke tabel rasio (tanpa mengubah input)"""
+    score = pd.Series(0, index=ratios.index, dtype=np.int64)
+    for column, op, threshold, points in rules:
+        score += rule_mask(ratios[column], op, threshold).to_numpy() * points
+
+    scored = ratios.copy()
+    scored["score"] = score.clip(upper=MAX_SCORE)
+    scored["rating"] = np.select(
+        [scored["score"].to_numpy() >= minimum for minimum, _ in bands],
+        [rating for _, rating in bands],
+        default=default
+    )
+    return scored
+
+
+def score_fundamentals(table, rules=SCORE_RULES, bands=RATING_BANDS, default=RATING_DEFAULT):
+    """Field mentah → rasio, growth, score dan rating untuk seluruh universe"""
+    return fundamental_scores(fundamental_ratios(table), rules, bands, default)
+
+
+def _optional(value):
+    return None if pd.isna(value) else float(value)
+
+
+def fundamental_result(row):
+    """Satu baris hasil score_fundamentals → dict results['fundamental']"""
+    return {
+        "roe": _optional(row["roe"]),
+        "roa": _optional(row["roa"]),
+        "npm": _optional(row["npm"]),
+        "der": _optional(row["der"]),
+        "pe": _optional(row["pe"]),
+        "pb": _optional(row["pb"]),
+        "revenue_growth": {"yoy": _optional(row["revenue_yoy"]), "qoq": _optional(row["revenue_qoq"])},
+        "netincome_growth": {"yoy": _optional(row["netincome_yoy"]), "qoq": _optional(row["netincome_qoq"])},
+        "operating_cf": _optional(row["operating_cf"]),
+        "score": int(row["score"]),
+        "rating": row["rating"],
+    }
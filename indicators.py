@@ -0,0 +1,647 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import copy
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Semua kernel menerima array 1-D (T,) atau 2-D (T, N) dengan sumbu 0 = waktu.
+# NaN hanya boleh berada di awal setiap kolom (sebelum data pertama).
+
+EMA_WINDOWS = (5, 9, 20, 50)
+
+
+# ===========================================
+# KERNEL DASAR
+# ===========================================
+def _as_2d(values):
+    values = np.asarray(values, dtype=float)
+    return values.reshape(len(values), -1), values.ndim == 1
+
+
+def _restore(values, squeeze):
+    return values[:, 0] if squeeze else values
+
+
+def first_valid(values):
+    """Index baris pertama yang bukan NaN per kolom (T jika kosong)"""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+
+
+def ewm(values, alpha, min_periods):
+    """
+    Exponential weighted mean (adjust=False), setara dengan
+    pandas `ewm(alpha=..., min_periods=..., adjust=False).mean()` per kolom.
+
+    values      : (T, M)
+    alpha       : skalar atau (M,)
+    min_periods : skalar atau (M,)
+    """
+    T, M = values.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (M,))
+    min_periods = np.broadcast_to(np.asarray(min_periods), (M,))
+    decay = 1 - alpha
+
+    start = first_valid(values)
+    starts_at = {}
+    for col, t in enumerate(start):
+        starts_at.setdefault(t, []).append(col)
+
+    weighted = alpha * values
+    out = np.empty((T, M))
+    state = np.full(M, np.nan)
+
+    for t in range(T):
+        state *= decay
+        state += weighted[t]
+        # Kolom yang baru mulai: state = nilai pertama
+        if t in starts_at:
+            cols = starts_at[t]
+            state[cols] = values[t, cols]
+        out[t] = state
+
+    # Belum cukup observasi → NaN
+    rows = np.arange(T)[:, None]
+    out[rows < start + min_periods - 1] = np.nan
+    return out
+
+
+def rolling_window(values, window, reducer):
+    """Rolling reducer (mean/std/min/max) ukuran `window`, NaN jika belum penuh"""
+    T, M = values.shape
+    out = np.full((T, M), np.nan)
+    if T >= window:
+        with np.errstate(invalid="ignore"):
+            out[window - 1:] = reducer(sliding_window_view(values, window, axis=0), axis=-1)
+    return out
+
+
+# ===========================================
+# INDIKATOR
+# ===========================================
+def ema(close, window):
+    """EMA, setara ta.trend.EMAIndicator"""
+    values, squeeze = _as_2d(close)
+    return _restore(ewm(values, 2 / (window + 1), window), squeeze)
+
+
+def _wilder_inputs(values):
+    # Sama seperti ta: diff pertama (NaN) dihitung 0, bukan NaN
+    diff = np.full_like(values, np.nan)
+    diff[1:] = values[1:] - values[:-1]
+
+    with np.errstate(invalid="ignore"):
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+
+    missing = np.isnan(values)
+    up[missing] = np.nan
+    down[missing] = np.nan
+    return up, down
+
+
+def _rsi_from_averages(avg_up, avg_down):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_up / avg_down
+        return np.where(avg_down == 0, 100.0, 100 - 100 / (1 + rs))
+
+
+def rsi(close, window=14):
+    """RSI Wilder, setara ta.momentum.RSIIndicator"""
+    values, squeeze = _as_2d(close)
+    up, down = _wilder_inputs(values)
+    averages = ewm(np.hstack([up, down]), 1 / window, window)
+    M = values.shape[1]
+    return _restore(_rsi_from_averages(averages[:, :M], averages[:, M:]), squeeze)
+
+
+def macd(close, window_fast=12, window_slow=26, window_sign=9):
+    """Return (MACD, MACD_SIGNAL), setara ta.trend.MACD"""
+    values, squeeze = _as_2d(close)
+    M = values.shape[1]
+    alphas = np.repeat([2 / (window_fast + 1), 2 / (window_slow + 1)], M)
+    periods = np.repeat([window_fast, window_slow], M)
+    emas = ewm(np.hstack([values, values]), alphas, periods)
+
+    line = emas[:, :M] - emas[:, M:]
+    signal = ewm(line, 2 / (window_sign + 1), window_sign)
+    return _restore(line, squeeze), _restore(signal, squeeze)
+
+
+def bollinger(close, window=20, window_dev=2):
+    """Return (BB_UPPER, BB_LOWER), setara ta.volatility.BollingerBands"""
+    values, squeeze = _as_2d(close)
+    mavg = rolling_window(values, window, np.mean)
+    mstd = rolling_window(values, window, np.std)
+    return (
+        _restore(mavg + window_dev * mstd, squeeze),
+        _restore(mavg - window_dev * mstd, squeeze),
+    )
+
+
+# ===========================================
+# INDICATOR SET (SATU PASS)
+# ===========================================
+def indicator_set(
+    close,
+    ema_windows=EMA_WINDOWS,
+    rsi_window=14,
+    macd_fast=12,
+    macd_slow=26,
+    macd_sign=9,
+    bb_window=20,
+    bb_dev=2,
+):
+    """
+    Hitung seluruh indikator teknikal StockAnalyzer sekaligus:
+    EMA_*, RSI, MACD, MACD_SIGNAL, BB_UPPER, BB_LOWER.
+
+    Semua EMA (termasuk EMA fast/slow MACD) dan rata-rata Wilder RSI
+    dihitung dalam satu loop rekursi atas kolom-kolom yang ditumpuk.
+    Return dict {nama_kolom: array} dengan bentuk sama seperti `close`.
+    """
+    values, squeeze = _as_2d(close)
+    M = values.shape[1]
+
+    spans = list(ema_windows) + [macd_fast, macd_slow]
+    up, down = _wilder_inputs(values)
+
+    stacked = np.hstack([values] * len(spans) + [up, down])
+    alphas = np.repeat([2 / (s + 1) for s in spans] + [1 / rsi_window] * 2, M)
+    periods = np.repeat(spans + [rsi_window] * 2, M)
+    averages = ewm(stacked, alphas, periods)
+
+    def block(k):
+        return averages[:, k * M:(k + 1) * M]
+
+    result = {}
+    for k, window in enumerate(ema_windows):
+        result[f"EMA_{window}"] = block(k)
+
+    k = len(ema_windows)
+    result["RSI"] = _rsi_from_averages(block(k + 2), block(k + 3))
+
+    line = block(k) - block(k + 1)
+    result["MACD"] = line
+    result["MACD_SIGNAL"] = ewm(line, 2 / (macd_sign + 1), macd_sign)
+
+    mavg = rolling_window(values, bb_window, np.mean)
+    mstd = rolling_window(values, bb_window, np.std)
+    result["BB_UPPER"] = mavg + bb_dev * mstd
+    result["BB_LOWER"] = mavg - bb_dev * mstd
+
+    return {name: _restore(arr, squeeze) for name, arr in result.items()}
+
+
+# ===========================================
+# LEVELS (SUPPORT / RESISTANCE / RENTANG HARGA)
+# ===========================================
+# Jendela rentang harga dalam jumlah bar harian
+WEEK_WINDOWS = {"10w": 50, "30w": 150, "52w": 252}
+
+
+def suffix_extremes(values, max_window):
+    """
+    Min & max untuk setiap panjang ekor data dalam satu pass:
+    suffix_min[k-1] = min(values[-k:]), k = 1..max_window.
+    NaN ikut terbawa (sama seperti rolling dengan min_periods penuh).
+    """
+    values = np.asarray(values, dtype=float)
+    tail = values[max(len(values) - max_window, 0):][::-1]
+    # np.minimum/np.maximum meneruskan NaN
+    return np.minimum.accumulate(tail), np.maximum.accumulate(tail)
+
+
+def tail_levels(high, low, windows):
+    """
+    Nilai rolling(window).min/max().iloc[-1] untuk beberapa jendela sekaligus,
+    tanpa menghitung seluruh deret rolling.
+
+    windows : list jendela atau dict {nama: jendela}
+    Return (support, resistance) dengan bentuk sama seperti `windows`;
+    NaN jika data kurang dari jendela.
+    """
+    named = windows if isinstance(windows, dict) else dict(enumerate(windows))
+    n = min(len(high), len(low))
+    max_window = max(named.values()) if named else 0
+
+    low_min, _ = suffix_extremes(low, max_window)
+    _, high_max = suffix_extremes(high, max_window)
+
+    support, resistance = {}, {}
+    for name, window in named.items():
+        if n >= window:
+            support[name] = low_min[window - 1]
+            resistance[name] = high_max[window - 1]
+        else:
+            support[name] = np.nan
+            resistance[name] = np.nan
+
+    if isinstance(windows, dict):
+        return support, resistance
+    return [support[k] for k in named], [resistance[k] for k in named]
+
+
+def tail_mean(values, window):
+    """Nilai rolling(window).mean().iloc[-1] (NaN jika data kurang)"""
+    values = np.asarray(values, dtype=float)
+    if len(values) < window:
+        return np.nan
+    return values[-window:].mean()
+
+
+# ===========================================
+# PANEL (TANGGAL × TICKER) UNTUK SELURUH UNIVERSE
+# ===========================================
+def price_panel(frames, fields=("Close", "High", "Low")):
+    """
+    Susun dict {ticker: DataFrame OHLCV} menjadi panel per kolom:
+    {"Close": DataFrame(tanggal × ticker), ...}
+    """
+    return {
+        field: pd.DataFrame({ticker: df[field] for ticker, df in frames.items()}).sort_index()
+        for field in fields
+    }
+
+
+def pack_right(valid):
+    """
+    Urutan baris per kolom agar baris valid terkumpul di bawah (urutan tetap),
+    sehingga baris terakhir = bar terbaru setiap ticker dan NaN hanya di awal.
+    """
+    return np.argsort(valid, axis=0, kind="stable")
+
+
+def _packed(matrix, order, valid):
+    packed = np.take_along_axis(matrix, order, axis=0).astype(float)
+    packed[~np.take_along_axis(valid, order, axis=0)] = np.nan
+    return packed
+
+
+def classify_technical(close, ema20, ema50, rsi_value, macd_value, macd_signal):
+    """Trend / momentum / signal versi array, aturan sama dengan StockAnalyzer.technical_analysis"""
+    with np.errstate(invalid="ignore"):
+        bullish = (close > ema20) & (ema20 > ema50)
+        bearish = (close < ema20) & (ema20 < ema50)
+        trend = np.select([bullish, bearish], ["BULLISH", "BEARISH"], "SIDEWAYS")
+
+        momentum = np.select(
+            [rsi_value > 60, rsi_value < 40],
+            ["KUAT (BULLISH)", "LEMAH (BEARISH)"],
+            "NETRAL"
+        )
+
+        buy = bullish & (close > ema20) & (rsi_value > 50) & (macd_value > macd_signal)
+        sell = bearish & (close < ema20) & (rsi_value < 50) & (macd_value < macd_signal)
+        signal = np.select([buy, sell], ["BUY", "SELL"], "NO TRADE")
+
+    return trend, momentum, signal
+
+
+def _packed_panel(close, high, low, **kwargs):
+    matrices = [m.to_numpy(dtype=float) for m in (close, high, low) if m is not None]
+    valid = np.logical_and.reduce([~np.isnan(m) for m in matrices])
+    order = pack_right(valid)
+    packed = indicator_set(_packed(matrices[0], order, valid), **kwargs)
+    return packed, order, valid
+
+
+def screen_panel(close, high, low, support_windows=(10, 30), **kwargs):
+    """
+    Ringkasan teknikal terbaru untuk seluruh universe dalam satu pass:
+    close, indikator terakhir, support/resistance, trend, momentum, signal.
+    Return DataFrame dengan index ticker.
+    """
+    packed, order, valid = _packed_panel(close, high, low, **kwargs)
+
+    # Bar terakhir (valid) setiap ticker ada di baris paling bawah data packed
+    close_p = _packed(close.to_numpy(dtype=float), order, valid)
+    high_p = _packed(high.to_numpy(dtype=float), order, valid)
+    low_p = _packed(low.to_numpy(dtype=float), order, valid)
+
+    snapshot = pd.DataFrame(index=close.columns)
+    snapshot["close"] = close_p[-1]
+
+    for name, values in packed.items():
+        snapshot[name] = values[-1]
+
+    for k, window in enumerate(support_windows, start=1):
+        if len(close_p) >= window:
+            snapshot[f"support_{k}"] = low_p[-window:].min(axis=0)
+            snapshot[f"resistance_{k}"] = high_p[-window:].max(axis=0)
+        else:
+            snapshot[f"support_{k}"] = np.nan
+            snapshot[f"resistance_{k}"] = np.nan
+
+    snapshot["trend"], snapshot["momentum"], snapshot["signal"] = classify_technical(
+        snapshot["close"].to_numpy(),
+        snapshot["EMA_20"].to_numpy(),
+        snapshot["EMA_50"].to_numpy(),
+        snapshot["RSI"].to_numpy(),
+        snapshot["MACD"].to_numpy(),
+        snapshot["MACD_SIGNAL"].to_numpy(),
+    )
+
+    return snapshot
+
+
+# ===========================================
+# STATE INDIKATOR INKREMENTAL (O(1) PER BAR)
+# ===========================================
+class IndicatorState:
+    """
+    State indikator yang bisa dilanjutkan bar demi bar:
+    nilai EMA terakhir, rata-rata Wilder RSI, state signal MACD dan jendela
+    close/high/low terakhir untuk Bollinger & support/resistance.
+
+    EMA, RSI & MACD bergantung pada bar pertama yang dihitung, jadi hasil
+    update() hanya sama dengan indicator_set() bila riwayatnya dimulai dari
+    bar pertama state (first_date). State bisa disimpan/dimuat lewat
+    to_dict()/from_dict(); resume() hanya melanjutkan jika jendela riwayat
+    masih dimulai dari first_date.
+    """
+
+    def __init__(
+        self,
+        ema_windows=EMA_WINDOWS,
+        rsi_window=14,
+        macd_fast=12,
+        macd_slow=26,
+        macd_sign=9,
+        bb_window=20,
+        bb_dev=2,
+        level_windows=(10, 30),
+    ):
+        self.ema_windows = tuple(ema_windows)
+        self.rsi_window = rsi_window
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_sign = macd_sign
+        self.bb_window = bb_window
+        self.bb_dev = bb_dev
+        self.level_windows = tuple(level_windows)
+
+        self.count = 0
+        self.last_close = None
+        # Tanggal bar pertama & terakhir (untuk resume dari riwayat harga)
+        self.first_date = None
+        self.last_date = None
+        self.ema = {span: None for span in self.spans}
+        self.avg_up = None
+        self.avg_down = None
+        self.signal = None
+        self.signal_count = 0
+        self.closes = deque(maxlen=bb_window)
+        self.highs = deque(maxlen=max(self.level_windows))
+        self.lows = deque(maxlen=max(self.level_windows))
+
+        # State sebelum bar terakhir, untuk merevisi bar yang belum final
+        self._previous = None
+
+    @property
+    def spans(self):
+        return list(dict.fromkeys(list(self.ema_windows) + [self.macd_fast, self.macd_slow]))
+
+    @staticmethod
+    def _ewm_step(state, alpha, x):
+        if state is None:
+            return x
+        return state * (1 - alpha) + alpha * x
+
+    def _copy(self):
+        other = copy.copy(self)
+        other.ema = dict(self.ema)
+        other.closes = deque(self.closes, maxlen=self.closes.maxlen)
+        other.highs = deque(self.highs, maxlen=self.highs.maxlen)
+        other.lows = deque(self.lows, maxlen=self.lows.maxlen)
+        other._previous = None
+        return other
+
+    @property
+    def last_bar(self):
+        """(close, high, low) bar terakhir, None jika belum ada bar"""
+        if not self.closes:
+            return None
+        return self.closes[-1], self.highs[-1], self.lows[-1]
+
+    def update(self, close, high, low, replace_last=False, date=None):
+        """
+        Tambahkan satu bar dan kembalikan nilai indikator terbaru (snapshot()).
+        replace_last=True: bar ini menggantikan bar terakhir (mis. candle
+        intraday yang belum selesai), bukan bar baru.
+        """
+        if replace_last and self._previous is not None:
+            self.__dict__.update(self._previous._copy().__dict__)
+            self._previous = None
+
+        self._previous = self._copy()
+        self._advance(float(close), float(high), float(low))
+        self.last_date = date
+        return self.snapshot()
+
+    @staticmethod
+    def _same_date(a, b):
+        try:
+            return a is not None and b is not None and a == b
+        except TypeError:
+            # Tanggal tanpa timezone vs dengan timezone
+            return False
+
+    def _position(self, dates):
+        # Posisi last_date di index tanggal, None jika tidak ada
+        if self.last_date is None or len(dates) == 0:
+            return None
+        try:
+            position = dates.searchsorted(self.last_date)
+        except TypeError:
+            # Index tanpa timezone vs tanggal state dengan timezone (atau sebaliknya)
+            return None
+        if position < len(dates) and dates[position] == self.last_date:
+            return position
+        return None
+
+    def resume(self, dates, close, high, low):
+        """
+        Lanjutkan state dengan bar riwayat setelah last_date saja (O(bar baru)).
+
+        dates, close, high, low : riwayat harga lengkap (DatetimeIndex & array)
+        Jika bar terakhir state berubah (candle belum final saat disimpan),
+        dilanjutkan dari state sebelumnya. Return state baru, atau None jika
+        hasilnya tidak akan sama dengan hitung ulang penuh → bangun ulang
+        dengan from_history:
+        - jendela riwayat tidak dimulai dari first_date (mis. jendela period
+          bergeser ke depan setelah hari berganti)
+        - riwayat tidak cocok lagi (bar hilang / harga di-adjust ulang)
+        """
+        if len(dates) == 0 or not self._same_date(dates[0], self.first_date):
+            return None
+
+        close = np.asarray(close, dtype=float)
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+
+        for base in (self, self._previous):
+            if base is None:
+                continue
+            position = base._position(dates)
+            if position is None:
+                continue
+
+            stored = np.array(base.last_bar, dtype=float)
+            current = np.array([close[position], high[position], low[position]])
+            if not np.allclose(stored, current, rtol=1e-9):
+                continue
+
+            state = base._copy()
+            state._previous = base._previous
+            for i in range(position + 1, len(dates)):
+                state.update(close[i], high[i], low[i], date=dates[i])
+            return state
+
+        return None
+
+    def _advance(self, close, high, low):
+        # EMA (termasuk fast/slow MACD)
+        for span in self.ema:
+            self.ema[span] = self._ewm_step(self.ema[span], 2 / (span + 1), close)
+
+        # Wilder RSI (diff bar pertama dihitung 0, sama seperti ta)
+        diff = close - self.last_close if self.last_close is not None else 0.0
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        self.avg_up = self._ewm_step(self.avg_up, 1 / self.rsi_window, up)
+        self.avg_down = self._ewm_step(self.avg_down, 1 / self.rsi_window, down)
+
+        self.count += 1
+        self.last_close = close
+
+        # Signal MACD mulai dihitung setelah garis MACD valid
+        if self.count >= self.macd_slow:
+            line = self.ema[self.macd_fast] - self.ema[self.macd_slow]
+            self.signal = self._ewm_step(self.signal, 2 / (self.macd_sign + 1), line)
+            self.signal_count += 1
+
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+
+    def snapshot(self):
+        """Nilai indikator bar terakhir (NaN jika data belum cukup)"""
+        nan = float("nan")
+        result = {}
+
+        for span in self.ema_windows:
+            result[f"EMA_{span}"] = self.ema[span] if self.count >= span else nan
+
+        if self.count >= self.rsi_window:
+            if self.avg_down == 0:
+                result["RSI"] = 100.0
+            else:
+                result["RSI"] = 100 - 100 / (1 + self.avg_up / self.avg_down)
+        else:
+            result["RSI"] = nan
+
+        if self.count >= self.macd_slow:
+            result["MACD"] = self.ema[self.macd_fast] - self.ema[self.macd_slow]
+        else:
+            result["MACD"] = nan
+        result["MACD_SIGNAL"] = self.signal if self.signal_count >= self.macd_sign else nan
+
+        if len(self.closes) == self.bb_window:
+            window = np.array(self.closes)
+            mavg, mstd = window.mean(), window.std()
+            result["BB_UPPER"] = mavg + self.bb_dev * mstd
+            result["BB_LOWER"] = mavg - self.bb_dev * mstd
+        else:
+            result["BB_UPPER"] = nan
+            result["BB_LOWER"] = nan
+
+        result["support"] = [
+            min(list(self.lows)[-w:]) if self.count >= w else nan
+            for w in self.level_windows
+        ]
+        result["resistance"] = [
+            max(list(self.highs)[-w:]) if self.count >= w else nan
+            for w in self.level_windows
+        ]
+
+        return result
+
+    @classmethod
+    def from_history(cls, close, high, low, dates=None, **kwargs):
+        """
+        Bangun state dengan memutar ulang seluruh riwayat bar (O(n), hanya
+        untuk cold start atau setelah riwayat harga berubah).
+        """
+        state = cls(**kwargs)
+        bars = list(zip(
+            np.asarray(close, dtype=float).tolist(),
+            np.asarray(high, dtype=float).tolist(),
+            np.asarray(low, dtype=float).tolist()
+        ))
+
+        dates = dates if dates is not None and len(dates) == len(bars) else None
+
+        for c, h, l in bars[:-1]:
+            state._advance(c, h, l)
+        if bars:
+            if dates is not None:
+                state.first_date = dates[0]
+                # State sebelumnya ikut menyimpan tanggal bar sebelum terakhir
+                state.last_date = dates[-2] if len(bars) > 1 else None
+            # Bar terakhir lewat update() agar masih bisa direvisi
+            state.update(*bars[-1], date=None if dates is None else dates[-1])
+        return state
+
+    def to_dict(self):
+        return {
+            "config": {
+                "ema_windows": list(self.ema_windows),
+                "rsi_window": self.rsi_window,
+                "macd_fast": self.macd_fast,
+                "macd_slow": self.macd_slow,
+                "macd_sign": self.macd_sign,
+                "bb_window": self.bb_window,
+                "bb_dev": self.bb_dev,
+                "level_windows": list(self.level_windows),
+            },
+            "count": self.count,
+            "last_close": self.last_close,
+            "ema": {str(span): value for span, value in self.ema.items()},
+            "avg_up": self.avg_up,
+            "avg_down": self.avg_down,
+            "signal": self.signal,
+            "signal_count": self.signal_count,
+            "closes": list(self.closes),
+            "highs": list(self.highs),
+            "lows": list(self.lows),
+            "first_date": None if self.first_date is None else pd.Timestamp(self.first_date).isoformat(),
+            "last_date": None if self.last_date is None else pd.Timestamp(self.last_date).isoformat(),
+            # State sebelum bar terakhir (bar terakhir bisa direvisi setelah dimuat)
+            "previous": None if self._previous is None else self._previous.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(**data["config"])
+        state.count = data["count"]
+        state.last_close = data["last_close"]
+        state.ema = {int(span): value for span, value in data["ema"].items()}
+        state.avg_up = data["avg_up"]
+        state.avg_down = data["avg_down"]
+        state.signal = data["signal"]
+        state.signal_count = data["signal_count"]
+        state.closes.extend(data["closes"])
+        state.highs.extend(data["highs"])
+        state.lows.extend(data["lows"])
+        first_date = data.get("first_date")
+        state.first_date = None if first_date is None else pd.Timestamp(first_date)
+        last_date = data.get("last_date")
+        state.last_date = None if last_date is None else pd.Timestamp(last_date)
+        previous = data.get("previous")
+        state._previous = None if previous is None else cls.from_dict(previous)
+        return state
@@ -0,0 +1,839 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import cached_property
+
+import numpy as np
+import yfinance as yf
+import pandas as pd
+
+from timings import record_request, record_wait
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# Kolom harga yang ikut di-adjust Yahoo saat ada split / dividen
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+# Panjang period yfinance dalam bentuk offset tanggal
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+# ===========================================
+# RATE LIMITER YAHOO FINANCE
+# ===========================================
+def is_throttle_error(error):
+    """Cek apakah error berasal dari pembatasan request Yahoo (HTTP 429)"""
+    rate_limit_error = getattr(getattr(yf, "exceptions", None), "YFRateLimitError", None)
+    if rate_limit_error is not None and isinstance(error, rate_limit_error):
+        return True
+    text = str(error).lower()
+    return "429" in text or "too many requests" in text or "rate limit" in text
+
+
+class RateLimiter:
+    """
+    Token bucket global untuk semua request ke Yahoo Finance.
+
+    - `rate` request/detik dengan `burst` token cadangan
+    - jumlah request bersamaan dibatasi `concurrency`
+    - saat di-throttle (YFRateLimitError / HTTP 429): rate & concurrency dipotong
+      setengah, lalu request diulang dengan exponential backoff + jitter
+    - respons kosong (saham delisting / suspensi / tanpa data) bukan throttle:
+      langsung dikembalikan tanpa diulang (lihat download untuk yf.download,
+      yang menelan error 429 per ticker)
+    - setiap request sukses menaikkan rate & concurrency sedikit demi sedikit
+    """
+
+    def __init__(
+        self,
+        rate=4.0,
+        burst=8,
+        min_rate=0.25,
+        max_rate=8.0,
+        concurrency=8,
+        max_concurrency=8,
+        max_retries=5,
+        base_delay=1.0,
+        max_delay=60.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.in_flight = 0
+        self.throttled = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.in_flight < self.concurrency and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate if self.tokens < 1 else None
+                self._cond.wait(timeout=wait)
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + 0.05)
+            if self.rate >= self.max_rate / 2:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self._cond.notify_all()
+
+    def on_throttle(self):
+        with self._cond:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.concurrency = max(1, self.concurrency // 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def backoff(self, attempt):
+        # Full jitter: acak antara 0 dan batas exponential
+        time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def call(self, fn, *args, **kwargs):
+        """Panggil `fn` lewat limiter, ulangi hanya jika di-throttle"""
+        for attempt in range(self.max_retries + 1):
+            queued = time.perf_counter()
+            self.acquire()
+            started = time.perf_counter()
+            record_wait(started - queued)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                record_request(time.perf_counter() - started)
+                if not is_throttle_error(e) or attempt == self.max_retries:
+                    raise
+                self.on_throttle()
+            else:
+                record_request(time.perf_counter() - started, result)
+                self.on_success()
+                return result
+            finally:
+                self.release()
+
+            sleep_start = time.perf_counter()
+            self.backoff(attempt)
+            record_wait(time.perf_counter() - sleep_start)
+
+
+# Limiter bersama untuk seluruh proses
+YAHOO_LIMITER = RateLimiter()
+
+# Batch multi-ticker yang seluruhnya kosong diulang sekian kali (tanpa menurunkan rate)
+EMPTY_BATCH_RETRIES = 1
+
+
+class DownloadThrottled(Exception):
+    """yf.download selesai tanpa exception, tetapi ada ticker yang kena 429"""
+
+
+class _DownloadErrors(logging.Handler):
+    """
+    yf.download (yfinance 1.x) tidak melempar error per ticker, hanya
+    menuliskannya ke logger "yfinance" di thread pemanggil setelah selesai.
+    Handler ini menampung pesan error tersebut per thread selama capture()
+    aktif. Log tetap tampil di stderr seperti sebelum handler dipasang.
+    """
+
+    def __init__(self, logger_name="yfinance"):
+        super().__init__()
+        self.logger_name = logger_name
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self):
+        self._local.messages = []
+        try:
+            yield self._local.messages
+        finally:
+            self._local.messages = None
+
+    def _only_handler(self):
+        # Tanpa handler ini, logging memakai logging.lastResort (stderr)
+        return (
+            logging.getLogger(self.logger_name).handlers == [self]
+            and not logging.getLogger().handlers
+        )
+
+    def emit(self, record):
+        messages = getattr(self._local, "messages", None)
+        if messages is not None and record.levelno >= logging.ERROR:
+            messages.append(record.getMessage())
+
+        if logging.lastResort is not None and self._only_handler():
+            logging.lastResort.handle(record)
+
+
+_DOWNLOAD_ERRORS = _DownloadErrors()
+logging.getLogger(_DOWNLOAD_ERRORS.logger_name).addHandler(_DOWNLOAD_ERRORS)
+
+
+# ===========================================
+# BATCH DOWNLOAD OHLCV
+# ===========================================
+def _checked_download(tickers, **kwargs):
+    # State yf.download per panggilan (yfinance 1.x), aman dari banyak thread
+    with _DOWNLOAD_ERRORS.capture() as errors:
+        raw = yf.download(tickers, **kwargs)
+
+    throttled = [message for message in errors if is_throttle_error(message)]
+    if throttled:
+        # Diubah jadi exception agar RateLimiter.call memperlambat & mengulang
+        raise DownloadThrottled("; ".join(throttled))
+    return raw
+
+
+def download(tickers, **kwargs):
+    """
+    yf.download lewat rate limiter, aman dipanggil dari banyak thread.
+
+    Error 429 per ticker (hanya di-log yfinance) diperlakukan sebagai throttle.
+    Batch multi-ticker yang seluruhnya kosong tanpa error diulang
+    EMPTY_BATCH_RETRIES kali setelah jeda, tanpa menurunkan rate; satu
+    ticker yang kosong dianggap memang tanpa data.
+    """
+    kwargs.setdefault("progress", False)
+    batch = not isinstance(tickers, str) and len(tickers) > 1
+    retries = EMPTY_BATCH_RETRIES if batch else 0
+
+    for attempt in range(retries + 1):
+        raw = YAHOO_LIMITER.call(_checked_download, tickers, **kwargs)
+        if raw is not None and not raw.empty:
+            break
+        if attempt < retries:
+            sleep_start = time.perf_counter()
+            YAHOO_LIMITER.backoff(attempt)
+            record_wait(time.perf_counter() - sleep_start)
+    return raw
+
+
+def chunked(items, size):
+    """Bagi list menjadi potongan berukuran `size`"""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def split_multi_ticker_frame(raw, tickers):
+    """
+    Pecah hasil yf.download multi-ticker menjadi dict {ticker: DataFrame}.
+    Kolom setiap DataFrame dinormalisasi ke Open/High/Low/Close/Volume.
+    """
+    frames = {}
+
+    if raw is None or raw.empty:
+        return frames
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Hanya satu ticker, kolom sudah datar
+        if len(tickers) == 1:
+            frames[tickers[0]] = raw
+        return frames
+
+    level_0 = set(raw.columns.get_level_values(0))
+
+    for ticker in tickers:
+        if ticker in level_0:
+            df = raw[ticker]
+        elif ticker in set(raw.columns.get_level_values(1)):
+            df = raw.xs(ticker, axis=1, level=1)
+        else:
+            continue
+
+        df = df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+        df = df.dropna(how="all")
+
+        if not df.empty:
+            frames[ticker] = df
+
+    return frames
+
+
+def download_ohlcv_batch(tickers, period="3mo", interval="1d", chunk_size=100, **kwargs):
+    """
+    Download OHLCV banyak saham sekaligus dengan request multi-ticker per chunk.
+
+    Parameters:
+    -----------
+    tickers : list
+        Daftar kode saham (contoh: ["ANTM.JK", "BMRI.JK"])
+    period, interval : str
+        Sama seperti yf.download
+    chunk_size : int
+        Jumlah ticker per request
+
+    Return dict {ticker: DataFrame}. Ticker yang gagal/kosong tidak dimasukkan,
+    sehingga pemanggil bisa fallback ke download per ticker.
+    """
+    frames = {}
+
+    for chunk in chunked(tickers, chunk_size):
+        try:
+            raw = download(
+                chunk,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                threads=True,
+                **kwargs
+            )
+        except Exception as e:
+            print(f"⚠️ Batch download gagal ({chunk[0]} .. {chunk[-1]}): {e}")
+            continue
+
+        frames.update(split_multi_ticker_frame(raw, chunk))
+
+    return frames
+
+
+def normalize_ohlcv(df):
+    """Ratakan kolom MultiIndex hasil yf.download dan ambil kolom OHLCV saja"""
+    if df is None:
+        return None
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+
+    df = df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+    return df.dropna(how="all")
+
+
+def pack_ohlcv(df):
+    """
+    Bentuk ringkas OHLCV untuk dikirim antar proses:
+    {"index": datetime64 (UTC jika ada tz), "tz", "name", "values": float64 (n × 5)}
+    """
+    df = normalize_ohlcv(df).reindex(columns=OHLCV_COLUMNS)
+    index = pd.DatetimeIndex(df.index)
+    return {
+        "index": index.values,
+        "tz": str(index.tz) if index.tz is not None else None,
+        "name": index.name,
+        "values": df.to_numpy(dtype=float),
+    }
+
+
+def unpack_ohlcv(packed):
+    """Kebalikan pack_ohlcv → DataFrame OHLCV"""
+    index = pd.DatetimeIndex(packed["index"], name=packed["name"])
+    if packed["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(packed["tz"])
+    return pd.DataFrame(packed["values"], index=index, columns=OHLCV_COLUMNS)
+
+
+def period_start(period, now):
+    """Tanggal awal jendela `period` dihitung mundur dari `now` (None = semua data)"""
+    if period is None or period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    return (now - PERIOD_OFFSETS[period]).normalize()
+
+
+# ===========================================
+# PRICE STORE (PARQUET PER TICKER)
+# ===========================================
+class PriceStore:
+    """
+    Penyimpanan OHLCV lokal, satu file Parquet per ticker per interval:
+        <root>/<interval>/<ticker>.parquet
+
+    Data dibaca dari disk terlebih dahulu. Ke Yahoo hanya untuk mengambil bar
+    yang belum ada (mulai dari dua bar terakhir yang tersimpan), lalu di-append.
+
+    Harga Yahoo sudah di-adjust (split & dividen) per waktu pengambilan.
+    Bar tumpang tindih yang sudah final dibandingkan dengan data tersimpan;
+    jika berbeda berarti ada aksi korporasi dan seluruh riwayat diambil ulang.
+    """
+
+    def __init__(
+        self,
+        root="data/prices",
+        max_age=pd.Timedelta(hours=1),
+        coverage_slack=pd.Timedelta(days=7),
+        adjust_tolerance=1e-4,
+    ):
+        self.root = root
+        # Umur file maksimal sebelum dicek ulang ke Yahoo
+        self.max_age = max_age
+        # Toleransi libur bursa saat mengecek apakah riwayat sudah mencakup period
+        self.coverage_slack = coverage_slack
+        # Selisih relatif maksimal bar tumpang tindih (pembulatan Yahoo)
+        self.adjust_tolerance = adjust_tolerance
+
+    def path(self, ticker, interval):
+        return os.path.join(self.root, interval, f"{ticker}.parquet")
+
+    def read(self, ticker, interval):
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"⚠️ File harga rusak, diabaikan ({path}): {e}")
+            return None
+
+    def write(self, ticker, interval, df):
+        path = self.path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Tulis ke file sementara lalu rename agar file tidak setengah jadi
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    def replace(self, ticker, interval, new, full_history=False):
+        """
+        Timpa riwayat tersimpan dengan hasil download penuh.
+        full_history=True: hasil period="max" (riwayat sejak listing).
+        """
+        new = normalize_ohlcv(new)
+        if new is None or new.empty:
+            return self.read(ticker, interval)
+
+        df = new[~new.index.duplicated(keep="last")].sort_index()
+        df.attrs["full_history"] = bool(full_history)
+        self.write(ticker, interval, df)
+        return df
+
+    def overlap_matches(self, stored, new):
+        """
+        Bandingkan bar tumpang tindih yang sudah final (semua kecuali bar
+        terakhir tersimpan, yang bisa jadi candle belum selesai).
+        False = harga lama sudah tidak sesuai adjustment terbaru.
+        """
+        common = stored.index[:-1].intersection(new.index)
+        if common.empty:
+            return True
+
+        columns = [c for c in PRICE_COLUMNS if c in stored.columns and c in new.columns]
+        return np.allclose(
+            stored.loc[common, columns].to_numpy(dtype=float),
+            new.loc[common, columns].to_numpy(dtype=float),
+            rtol=self.adjust_tolerance,
+            equal_nan=True
+        )
+
+    def append(self, ticker, interval, new):
+        """
+        Gabungkan bar baru ke data tersimpan (bar terakhir yang belum final ditimpa).
+        Return None tanpa menulis apa pun jika bar tumpang tindih berbeda
+        (split / dividen) → pemanggil harus mengambil ulang seluruh riwayat.
+        """
+        stored = self.read(ticker, interval)
+        new = normalize_ohlcv(new)
+
+        if new is None or new.empty:
+            return stored
+
+        if stored is None or stored.empty:
+            return self.replace(ticker, interval, new)
+
+        if not self.overlap_matches(stored, new):
+            return None
+
+        merged = pd.concat([stored, new])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        merged.attrs = dict(stored.attrs)
+
+        self.write(ticker, interval, merged)
+        return merged
+
+    def refetch_start(self, stored):
+        """Tanggal mulai download ulang agar cakupan riwayat tetap sama"""
+        return stored.index[0]
+
+    def is_fresh(self, ticker, interval):
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return False
+        age = pd.Timestamp.now() - pd.Timestamp.fromtimestamp(os.path.getmtime(path))
+        return age <= self.max_age
+
+    def covers(self, stored, period):
+        """Cek apakah data tersimpan sudah mencakup seluruh jendela `period`"""
+        if stored is None or stored.empty:
+            return False
+        if period is None or period == "max":
+            # Hanya riwayat hasil download period="max" yang pasti lengkap
+            return bool(stored.attrs.get("full_history", False))
+        now = pd.Timestamp.now(tz=stored.index.tz)
+        start = period_start(period, now)
+        return stored.index[0] <= start + self.coverage_slack
+
+    def window(self, stored, period):
+        """Potong data tersimpan sesuai jendela `period`"""
+        if stored is None:
+            return None
+        start = period_start(period, pd.Timestamp.now(tz=stored.index.tz))
+        if start is None:
+            return stored
+        return stored[stored.index >= start]
+
+    def plan(self, ticker, period, interval):
+        """
+        Tentukan apa yang perlu diambil dari Yahoo untuk satu ticker.
+        Return ("full", None), ("incremental", tanggal_mulai) atau ("fresh", None).
+        """
+        stored = self.read(ticker, interval)
+
+        if not self.covers(stored, period):
+            return "full", None
+        if self.is_fresh(ticker, interval):
+            return "fresh", None
+        # Ambil ulang dua bar terakhir: bar terakhir bisa jadi belum final,
+        # bar sebelumnya untuk mengecek adjustment (lihat overlap_matches)
+        return "incremental", stored.index[max(len(stored) - 2, 0)]
+
+    def get(self, ticker, period="3mo", interval="1d"):
+        """Ambil OHLCV satu ticker: dari disk, ditambah bar yang kurang dari Yahoo"""
+        mode, start = self.plan(ticker, period, interval)
+
+        if mode != "fresh":
+            try:
+                if mode == "full":
+                    new = download(ticker, period=period, interval=interval)
+                    self.replace(ticker, interval, new, full_history=period == "max")
+                else:
+                    new = download(ticker, start=start, interval=interval)
+                    if self.append(ticker, interval, new) is None:
+                        self.refetch(ticker, interval)
+            except Exception as e:
+                # Tetap pakai data lokal jika Yahoo gagal
+                print(f"⚠️ Gagal memperbarui harga {ticker}: {e}")
+
+        df = self.window(self.read(ticker, interval), period)
+        return df if df is not None else pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    def refetch(self, ticker, interval):
+        """Ambil ulang seluruh riwayat tersimpan (harga lama sudah tidak sesuai adjustment)"""
+        stored = self.read(ticker, interval)
+        print(f"ℹ️ Harga {ticker} berubah (split/dividen), riwayat diambil ulang")
+        if stored.attrs.get("full_history"):
+            new = download(ticker, period="max", interval=interval)
+        else:
+            new = download(ticker, start=self.refetch_start(stored), interval=interval)
+        return self.replace(ticker, interval, new, stored.attrs.get("full_history", False))
+
+    def sync_batch(self, tickers, period="3mo", interval="1d", chunk_size=100):
+        """
+        Sinkronkan banyak ticker sekaligus dengan download multi-ticker:
+        ticker tanpa riwayat diambil penuh, ticker lama hanya bar terbarunya.
+        Return dict {ticker: DataFrame} sesuai jendela `period`.
+        """
+        full, incremental = [], {}
+
+        for ticker in tickers:
+            mode, start = self.plan(ticker, period, interval)
+            if mode == "full":
+                full.append(ticker)
+            elif mode == "incremental":
+                incremental[ticker] = start
+
+        fetched = download_ohlcv_batch(full, period=period, interval=interval, chunk_size=chunk_size)
+        for ticker, new in fetched.items():
+            self.replace(ticker, interval, new, full_history=period == "max")
+
+        # Kelompokkan per tanggal mulai agar tetap multi-ticker
+        adjusted = {}
+        for start, group in self._group_by_start(incremental).items():
+            fetched = download_ohlcv_batch(
+                group,
+                period=None,
+                interval=interval,
+                chunk_size=chunk_size,
+                start=start
+            )
+            for ticker, new in fetched.items():
+                if self.append(ticker, interval, new) is None:
+                    adjusted[ticker] = self.refetch_start(self.read(ticker, interval))
+
+        # Ada split / dividen: ambil ulang seluruh riwayat ticker tersebut
+        if adjusted:
+            print(f"ℹ️ {len(adjusted)} saham berubah harga (split/dividen), riwayat diambil ulang")
+        for start, group in self._group_by_start(adjusted).items():
+            fetched = download_ohlcv_batch(
+                group,
+                period=None,
+                interval=interval,
+                chunk_size=chunk_size,
+                start=start
+            )
+            for ticker, new in fetched.items():
+                full_history = self.read(ticker, interval).attrs.get("full_history", False)
+                self.replace(ticker, interval, new, full_history)
+
+        frames = {}
+        for ticker in tickers:
+            df = self.window(self.read(ticker, interval), period)
+            if df is not None and not df.empty:
+                frames[ticker] = df
+
+        return frames
+
+    @staticmethod
+    def _group_by_start(starts):
+        groups = {}
+        for ticker, start in starts.items():
+            groups.setdefault(start, []).append(ticker)
+        return groups
+
+
+# ===========================================
+# STATE INDIKATOR INKREMENTAL (JSON PER TICKER)
+# ===========================================
+class IndicatorStateStore:
+    """
+    State indikator (indicators.IndicatorState.to_dict) per ticker, disimpan
+    di samping PriceStore:
+        <root>/<period>_<interval>/<ticker>.json
+
+    Refresh berikutnya cukup memproses bar baru dari PriceStore
+    (IndicatorState.resume) tanpa menghitung ulang seluruh riwayat.
+    """
+
+    def __init__(self, root="data/indicators"):
+        self.root = root
+
+    def path(self, ticker, period, interval):
+        return os.path.join(self.root, f"{period}_{interval}", f"{ticker}.json")
+
+    def read(self, ticker, period, interval):
+        path = self.path(ticker, period, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ State indikator rusak, diabaikan ({path}): {e}")
+            return None
+
+    def write(self, ticker, period, interval, state):
+        path = self.path(ticker, period, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+
+# ===========================================
+# FUNDAMENTALS CACHE (PER PERIODE LAPORAN)
+# ===========================================
+STATEMENTS = [
+    "financials",
+    "balance_sheet",
+    "cashflow",
+    "quarterly_financials",
+    "quarterly_cashflow",
+]
+
+
+def latest_fiscal_period(statements):
+    """Tanggal periode laporan terbaru dari kolom laporan kuartalan/tahunan"""
+    for name in ["quarterly_financials", "financials", "balance_sheet"]:
+        df = statements.get(name)
+        if isinstance(df, pd.DataFrame) and len(df.columns) > 0:
+            try:
+                return pd.Timestamp(max(pd.to_datetime(df.columns)))
+            except Exception:
+                continue
+    return None
+
+
+class FundamentalsCache:
+    """
+    Cache laporan keuangan di disk, satu file per ticker:
+        <root>/<ticker>.pkl  ->  {"fetched_at", "latest_period", "statements"}
+
+    Kedaluwarsa ditentukan oleh musim laporan, bukan jam:
+    - sebelum akhir kuartal berikutnya tidak mungkin ada laporan baru → tetap dipakai
+    - setelah itu (musim laporan) dicek ulang setiap `season_recheck`
+    - lewat `season_length` (emiten terlambat lapor) dicek ulang setiap `late_recheck`
+    """
+
+    def __init__(
+        self,
+        root="data/fundamentals",
+        season_length=pd.Timedelta(days=90),
+        season_recheck=pd.Timedelta(days=3),
+        late_recheck=pd.Timedelta(days=14),
+        missing_recheck=pd.Timedelta(days=1),
+    ):
+        self.root = root
+        self.season_length = season_length
+        self.season_recheck = season_recheck
+        self.late_recheck = late_recheck
+        # Ticker tanpa laporan sama sekali
+        self.missing_recheck = missing_recheck
+
+    def path(self, ticker):
+        return os.path.join(self.root, f"{ticker}.pkl")
+
+    def read(self, ticker):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            print(f"⚠️ Cache fundamental rusak, diabaikan ({path}): {e}")
+            return None
+
+    def write(self, ticker, statements):
+        entry = {
+            "fetched_at": pd.Timestamp.now(),
+            "latest_period": latest_fiscal_period(statements),
+            "statements": statements,
+        }
+
+        path = self.path(ticker)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pd.to_pickle(entry, tmp_path)
+        os.replace(tmp_path, path)
+        return entry
+
+    def is_stale(self, entry, now=None):
+        now = now or pd.Timestamp.now()
+        age = now - entry["fetched_at"]
+        latest = entry.get("latest_period")
+
+        if latest is None:
+            return age >= self.missing_recheck
+
+        next_period_end = latest + pd.offsets.QuarterEnd(1)
+
+        if now < next_period_end:
+            return False
+        if now < next_period_end + self.season_length:
+            return age >= self.season_recheck
+        return age >= self.late_recheck
+
+    def get(self, ticker, fetch):
+        """
+        Ambil laporan keuangan `ticker` dari cache.
+        `fetch` dipanggil (tanpa argumen) untuk mengambil dict laporan dari Yahoo
+        jika cache belum ada atau sudah kedaluwarsa.
+        """
+        entry = self.read(ticker)
+
+        if entry is not None and not self.is_stale(entry):
+            return entry["statements"]
+
+        try:
+            return self.write(ticker, fetch())["statements"]
+        except Exception as e:
+            if entry is not None:
+                print(f"⚠️ Gagal memperbarui fundamental {ticker}, pakai cache: {e}")
+                return entry["statements"]
+            raise
+
+
+# ===========================================
+# DATA CONTEXT PER TICKER
+# ===========================================
+class TickerData:
+    """
+    Konteks data satu saham untuk satu kali analisis.
+    Setiap atribut diambil dari Yahoo Finance sekali saja (lazy) lalu dipakai
+    bersama oleh semua metode analisis StockAnalyzer.
+    Laporan keuangan dibaca dari FundamentalsCache jika diberikan.
+    """
+
+    def __init__(self, ticker, fundamentals_cache=None):
+        self.symbol = ticker
+        self.fundamentals_cache = fundamentals_cache
+
+    @classmethod
+    def from_snapshot(cls, ticker, info, statements):
+        """Konteks dari data yang sudah diambil (tanpa akses jaringan untuk info & laporan)"""
+        data = cls(ticker)
+        data.info = info
+        data.statements = statements
+        return data
+
+    @cached_property
+    def ticker(self):
+        return yf.Ticker(self.symbol)
+
+    @cached_property
+    def info(self):
+        return YAHOO_LIMITER.call(lambda: self.ticker.info) or {}
+
+    @cached_property
+    def statements(self):
+        if self.fundamentals_cache is None:
+            return {}
+        return self.fundamentals_cache.get(self.symbol, self.fetch_statements)
+
+    def fetch_statement(self, name):
+        return YAHOO_LIMITER.call(getattr, self.ticker, name)
+
+    def fetch_statements(self):
+        return {name: self.fetch_statement(name) for name in STATEMENTS}
+
+    def statement(self, name):
+        if name in self.statements:
+            return self.statements[name]
+        return self.fetch_statement(name)
+
+    @cached_property
+    def financials(self):
+        return self.statement("financials")
+
+    @cached_property
+    def balance_sheet(self):
+        return self.statement("balance_sheet")
+
+    @cached_property
+    def cashflow(self):
+        return self.statement("cashflow")
+
+    @cached_property
+    def quarterly_financials(self):
+        return self.statement("quarterly_financials")
+
+    @cached_property
+    def quarterly_cashflow(self):
+        return self.statement("quarterly_cashflow")
@@ -0,0 +1,548 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+
+import pandas as pd
+
+from core import run_analysis, DEFAULT_PRICE_STORE, DEFAULT_FUNDAMENTALS_CACHE, DEFAULT_INDICATOR_STORE
+from fundamentals import compact_statements
+from indicators import IndicatorState, price_panel, screen_panel
+from market_data import TickerData, STATEMENTS, download, pack_ohlcv, unpack_ohlcv
+from recommendation import recommend_results
+from results_store import ResultsStore, results_frame, to_csv_frame, CSV_PATH
+from timings import StageTimings, record_rows, summarize_timings, RUN_KEY
+
+
+# ===========================================
+# BARIS HASIL SCREENING
+# ===========================================
+def result_to_row(ticker, data):
+    """Ratakan hasil StockAnalyzer.results menjadi satu baris idx_list.csv"""
+    return {
+        "Kode": ticker,
+
+        "info_longName": data["info"].get("longName"),
+        "info_sector": data["info"].get("sector"),
+        "info_industry": data["info"].get("industry"),
+        "info_marketCap": data["info"].get("marketCap"),
+        "info_category": data["info"].get("category"),
+
+        "trading_recommendation": data["trading_recommendation"].get("status"),
+
+        "technical_trend": data["technical"].get("trend"),
+        "technical_momentum": data["technical"].get("momentum"),
+        "technical_signal": data["technical"].get("signal"),
+        "technical_close": data["technical"].get("close"),
+        "technical_support_1": (data["technical"].get("support") or [None, None])[0],
+        "technical_support_2": (data["technical"].get("support") or [None, None])[1],
+        "technical_resistance_1": (data["technical"].get("resistance") or [None, None])[0],
+        "technical_resistance_2": (data["technical"].get("resistance") or [None, None])[1],
+
+        "price_action_market_structure": data["price_action"].get("market_structure"),
+        "price_action_market_total_zones": data["price_action"].get("total_zones"),
+
+        "fundamental_score": data["fundamental"].get("score"),
+        "fundamental_rating": data["fundamental"].get("rating"),
+
+        "valuation_score": data["valuation"].get("valuation_score"),
+        "valuation_conclusion": data["valuation"].get("valuation_conclusion"),
+        "valuation_reason": data["valuation"].get("valuation_reason"),
+        "valuation_notes": list(data["valuation"].get("valuation_notes", [])),
+
+        "info_website": data["info"].get("website"),
+    }
+
+
+def failed_row(ticker):
+    """Baris kosong untuk saham yang gagal diproses"""
+    return {
+        "Kode": ticker,
+
+        "technical_trend": None,
+        "technical_momentum": None,
+        "technical_signal": None,
+        "technical_close": None,
+        "technical_support_1": None,
+        "technical_support_2": None,
+        "technical_resistance_1": None,
+        "technical_resistance_2": None,
+
+        "price_action_market_structure": None,
+        "price_action_market_total_zones": None,
+
+        "fundamental_score": None,
+        "fundamental_rating": None,
+
+        "valuation_score": None,
+        "valuation_conclusion": None,
+        "valuation_reason": None,
+        "valuation_notes": None,
+    }
+
+
+# ===========================================
+# TAHAP I/O & TAHAP KOMPUTASI
+# ===========================================
+def fetch_inputs(
+    ticker,
+    period="6mo",
+    interval="1d",
+    price_data=None,
+    price_store=DEFAULT_PRICE_STORE,
+    fundamentals_cache=DEFAULT_FUNDAMENTALS_CACHE,
+    indicator_store=DEFAULT_INDICATOR_STORE,
+):
+    """
+    Tahap I/O: ambil semua data mentah satu saham (OHLCV, info, laporan,
+    state indikator tersimpan) dalam bentuk ringkas yang murah dikirim ke proses lain.
+    """
+    timings = StageTimings()
+
+    with timings.stage("fetch_prices"):
+        if price_data is None or price_data.empty:
+            if price_store is not None:
+                price_data = price_store.get(ticker, period, interval)
+            else:
+                price_data = download(ticker, period=period, interval=interval)
+
+        if price_data is None or price_data.empty:
+            raise ValueError(f"Data harga {ticker} kosong")
+        record_rows(len(price_data))
+
+    data = TickerData(ticker, fundamentals_cache=fundamentals_cache)
+
+    with timings.stage("fetch_info"):
+        info = data.info
+
+    with timings.stage("fetch_statements"):
+        statements = {name: data.statement(name) for name in STATEMENTS}
+        record_rows(sum(len(df) for df in statements.values() if isinstance(df, pd.DataFrame)))
+
+    return {
+        "ticker": ticker,
+        "prices": pack_ohlcv(price_data),
+        "info": info,
+        "statements": compact_statements(statements, STATEMENTS),
+        "indicator_state": indicator_store.read(ticker, period, interval) if indicator_store is not None else None,
+        "timings": timings.as_dict(),
+    }
+
+
+def compute_row(inputs, period="6mo", interval="1d"):
+    """
+    Tahap komputasi: analisis lengkap dari hasil fetch_inputs tanpa akses
+    jaringan maupun disk. Fungsi top-level agar bisa dijalankan di ProcessPoolExecutor.
+    Indikator teknikal dilanjutkan dari state tersimpan (hanya bar baru) selama
+    jendela harga masih dimulai dari bar yang sama, selain itu dihitung ulang.
+    Return (baris hasil, timing per tahap fetch + analisis, state indikator baru).
+    """
+    ticker = inputs["ticker"]
+    state = inputs.get("indicator_state")
+    analyzer = run_analysis(
+        ticker=ticker,
+        period=period,
+        interval=interval,
+        price_data=unpack_ohlcv(inputs["prices"]),
+        price_store=None,
+        ticker_data=TickerData.from_snapshot(ticker, inputs["info"], inputs["statements"]),
+        indicator_state=IndicatorState.from_dict(state) if state else None,
+        incremental=True
+    )
+    timings = {**inputs.get("timings", {}), **analyzer.timings.as_dict()}
+    return result_to_row(ticker, analyzer.results), timings, analyzer.indicator_state.to_dict()
+
+
+def analyze_to_row(ticker, period, interval, price_data=None, indicator_store=DEFAULT_INDICATOR_STORE):
+    inputs = fetch_inputs(ticker, period, interval, price_data, indicator_store=indicator_store)
+    row, _, state = compute_row(inputs, period, interval)
+    if indicator_store is not None:
+        indicator_store.write(ticker, period, interval, state)
+    return row
+
+
+# ===========================================
+# CHECKPOINT UPDATE
+# ===========================================
+def _json_default(value):
+    # Nilai numpy (int64/float64) → tipe Python biasa
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class UpdateCheckpoint:
+    """
+    Checkpoint update dalam file JSONL (append-only selama run), satu baris per saham selesai:
+        {"ticker", "status": "ok"|"failed", "updated_at", "row"}
+    Setelah run selesai file dipadatkan (compact) menjadi satu baris per ticker.
+
+    Jika update terhenti di tengah jalan, saham yang sudah selesai tidak perlu
+    diambil ulang. Record terakhir untuk satu ticker yang berlaku.
+    """
+
+    def __init__(self, period="6mo", interval="1d", root="data/checkpoint"):
+        self.path = os.path.join(root, f"update_{period}_{interval}.jsonl")
+
+    def load(self):
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Baris terakhir bisa terpotong jika proses mati saat menulis
+                    continue
+                records[record["ticker"]] = record
+
+        return records
+
+    def append(self, ticker, row, ok=True):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        record = {
+            "ticker": ticker,
+            "status": "ok" if ok else "failed",
+            "updated_at": pd.Timestamp.now().isoformat(),
+            "row": row,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=_json_default) + "\n")
+            f.flush()
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def compact(self):
+        """
+        Tulis ulang checkpoint: satu record terakhir per ticker.
+        Dipanggil setelah run selesai agar file tidak terus bertambah
+        satu baris per saham setiap update.
+        """
+        records = self.load()
+        if not records:
+            return records
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records.values():
+                f.write(json.dumps(record, default=_json_default) + "\n")
+        os.replace(tmp_path, self.path)
+        return records
+
+    def pending(self, tickers, records=None, retry_failed=True, stale_after=None):
+        """
+        Saham yang masih perlu diproses: belum ada di checkpoint, gagal
+        (jika retry_failed) atau lebih tua dari `stale_after` (Timedelta).
+        """
+        records = self.load() if records is None else records
+        now = pd.Timestamp.now()
+        todo = []
+
+        for ticker in tickers:
+            record = records.get(ticker)
+
+            if record is None:
+                todo.append(ticker)
+            elif record["status"] == "failed" and retry_failed:
+                todo.append(ticker)
+            elif stale_after is not None and now - pd.Timestamp(record["updated_at"]) > stale_after:
+                todo.append(ticker)
+
+        return todo
+
+
+# ===========================================
+# UPDATE ENGINE (I/O THREAD POOL + COMPUTE PROCESS POOL)
+# ===========================================
+def default_compute_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def run_update(
+    tickers,
+    period="6mo",
+    interval="1d",
+    price_map=None,
+    max_workers=8,
+    on_result=None,
+    checkpoint=None,
+    retry_failed=True,
+    stale_after=None,
+    compute_workers=None,
+    timings=None,
+    indicator_store=DEFAULT_INDICATOR_STORE,
+):
+    """
+    Analisis banyak saham dalam dua tahap yang berjalan tumpang tindih:
+    I/O (fetch_inputs) di thread pool, lalu komputasi (compute_row) di
+    process pool sehingga tidak tertahan GIL.
+
+    Parameters:
+    -----------
+    tickers : list
+        Daftar kode saham
+    price_map : dict, optional
+        {ticker: DataFrame} OHLCV hasil prefetch
+    max_workers : int
+        Batas jumlah pengambilan data yang berjalan bersamaan
+    on_result : callable, optional
+        Dipanggil di thread pemanggil setiap satu saham selesai:
+        on_result(done, total, ticker, error) — error None jika sukses
+    checkpoint : UpdateCheckpoint, optional
+        Jika diberikan, setiap hasil langsung ditulis ke checkpoint dan saham
+        yang sudah selesai dilewati (lihat UpdateCheckpoint.pending)
+    retry_failed, stale_after :
+        Aturan saham mana yang diproses ulang saat melanjutkan checkpoint
+    compute_workers : int, optional
+        Jumlah proses komputasi (default: jumlah core - 1).
+        0 = komputasi di thread pool I/O (tanpa proses terpisah); wajib
+        dari skrip tanpa `if __name__ == "__main__"` seperti Streamlit,
+        karena proses spawn mengimpor ulang modul __main__
+    timings : dict, optional
+        Jika diberikan, diisi {ticker: timing per tahap} untuk setiap saham
+        yang sukses (lihat timings.summarize_timings)
+    indicator_store : IndicatorStateStore, optional
+        State indikator per saham dibaca saat fetch dan disimpan setelah
+        analisis, sehingga update berikutnya dengan jendela harga yang sama
+        (mis. diulang di hari yang sama, atau period="max") hanya memproses bar baru
+
+    Return list baris hasil dengan urutan sama seperti `tickers`.
+    Saham yang gagal tetap menghasilkan baris (failed_row).
+    """
+    price_map = price_map or {}
+    rows = {}
+
+    if checkpoint is not None:
+        records = checkpoint.load()
+        rows = {ticker: record["row"] for ticker, record in records.items()}
+        todo = checkpoint.pending(tickers, records, retry_failed, stale_after)
+    else:
+        todo = list(tickers)
+
+    if compute_workers is None:
+        compute_workers = default_compute_workers()
+
+    done = 0
+
+    def finish(ticker, row, error):
+        nonlocal done
+        done += 1
+        rows[ticker] = row
+
+        if checkpoint is not None:
+            checkpoint.append(ticker, row, ok=error is None)
+
+        if on_result is not None:
+            on_result(done, len(todo), ticker, error)
+
+    with ExitStack() as stack:
+        io_pool = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, int(max_workers))))
+        if compute_workers > 0:
+            # spawn: aman dipanggil dari proses yang sudah punya banyak thread (Streamlit)
+            compute_pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=int(compute_workers),
+                mp_context=multiprocessing.get_context("spawn")
+            ))
+        else:
+            compute_pool = io_pool
+
+        # future → (ticker, tahap)
+        jobs = {
+            io_pool.submit(
+                fetch_inputs, ticker, period, interval, price_map.get(ticker),
+                indicator_store=indicator_store
+            ): (ticker, "fetch")
+            for ticker in todo
+        }
+
+        while jobs:
+            finished, _ = wait(jobs, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                ticker, stage = jobs.pop(future)
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Jika error per saham → tetap lanjut
+                    finish(ticker, failed_row(ticker), e)
+                    continue
+
+                if stage == "fetch":
+                    jobs[compute_pool.submit(compute_row, result, period, interval)] = (ticker, "compute")
+                else:
+                    row, ticker_timings, state = result
+                    if timings is not None:
+                        timings[ticker] = ticker_timings
+                    if indicator_store is not None:
+                        indicator_store.write(ticker, period, interval, state)
+                    finish(ticker, row, None)
+
+    if checkpoint is not None:
+        checkpoint.compact()
+
+    return [rows[ticker] for ticker in tickers if ticker in rows]
+
+
+# ===========================================
+# UPDATE idx_list.csv (DIPAKAI STREAMLIT & CLI)
+# ===========================================
+IDX_LIST_URL = "https://raw.githubusercontent.com/wildangunawan/Dataset-Saham-IDX/master/List%20Emiten/all.csv"
+RESULTS_PATH = CSV_PATH
+
+DEFAULT_RESULTS_STORE = ResultsStore()
+
+
+def load_universe(total_stocks=None, url=IDX_LIST_URL):
+    """Daftar ticker emiten IDX (format Yahoo: KODE.JK), `total_stocks` pertama"""
+    idx = pd.read_csv(url)
+    if total_stocks:
+        idx = idx.head(total_stocks)
+    tickers = idx["code"].dropna().unique()
+    return [f"{t}.JK" for t in tickers]
+
+
+def update_screener(
+    tickers,
+    period="6mo",
+    interval="1d",
+    max_workers=8,
+    compute_workers=None,
+    output=RESULTS_PATH,
+    resume=True,
+    retry_failed=True,
+    stale_after=pd.Timedelta(hours=24),
+    on_plan=None,
+    on_result=None,
+    on_summary=None,
+    store=DEFAULT_RESULTS_STORE,
+):
+    """
+    Alur lengkap tombol "🔄 Update": checkpoint → prefetch OHLCV →
+    run_update → urutkan per fundamental_score → simpan ke ResultsStore
+    (Parquet bertipe) dan ekspor CSV ke `output` (None = tanpa CSV).
+
+    on_plan(from_checkpoint, todo) dipanggil setelah checkpoint dibaca;
+    on_result diteruskan ke run_update; on_summary(summary) menerima
+    ringkasan waktu per tahap (timings.summarize_timings) setelah selesai.
+    Return DataFrame hasil screening yang sudah diurutkan.
+    """
+    # Checkpoint: hasil ditulis per saham, update bisa dilanjutkan
+    checkpoint = UpdateCheckpoint(period=period, interval=interval)
+    if not resume:
+        checkpoint.clear()
+
+    todo = checkpoint.pending(tickers, retry_failed=retry_failed, stale_after=stale_after)
+    if on_plan is not None:
+        on_plan(len(tickers) - len(todo), len(todo))
+
+    # Prefetch OHLCV saham yang diproses: baca store lokal,
+    # lalu ambil bar yang kurang dengan request multi-ticker
+    run_timings = StageTimings()
+    with run_timings.stage("prefetch"):
+        price_map = DEFAULT_PRICE_STORE.sync_batch(todo, period=period, interval=interval)
+        record_rows(sum(len(df) for df in price_map.values()))
+
+    # {ticker: timing per tahap}; prefetch multi-ticker dicatat di RUN_KEY
+    timings = {RUN_KEY: run_timings.as_dict()}
+
+    results = run_update(
+        tickers,
+        period=period,
+        interval=interval,
+        price_map=price_map,
+        max_workers=max_workers,
+        on_result=on_result,
+        checkpoint=checkpoint,
+        retry_failed=retry_failed,
+        stale_after=stale_after,
+        compute_workers=compute_workers,
+        timings=timings
+    )
+
+    if on_summary is not None:
+        on_summary(summarize_timings(timings))
+
+    df_sorted = results_frame(results).sort_values(by="fundamental_score", ascending=False)
+
+    if store is not None:
+        df_sorted = store.write(df_sorted)
+
+    if output:
+        to_csv_frame(df_sorted).to_csv(output, index=False)
+
+    return df_sorted
+
+
+# ===========================================
+# HITUNG ULANG TEKNIKAL SAJA (DARI STORE LOKAL)
+# ===========================================
+# Kolom screen_panel → kolom idx_list.csv
+TECHNICAL_COLUMNS = {
+    "trend": "technical_trend",
+    "momentum": "technical_momentum",
+    "signal": "technical_signal",
+    "close": "technical_close",
+    "support_1": "technical_support_1",
+    "support_2": "technical_support_2",
+    "resistance_1": "technical_resistance_1",
+    "resistance_2": "technical_resistance_2",
+}
+
+
+def recompute_technicals(
+    period="6mo",
+    interval="1d",
+    output=RESULTS_PATH,
+    store=DEFAULT_RESULTS_STORE,
+    price_store=DEFAULT_PRICE_STORE,
+):
+    """
+    Hitung ulang kolom technical_* & trading_recommendation hasil terbaru
+    dari OHLCV di PriceStore, tanpa request Yahoo: seluruh universe
+    disusun jadi satu panel lalu dihitung sekaligus dengan screen_panel.
+    Fundamental, valuasi & price action tidak berubah.
+
+    Saham tanpa data harga lokal dibiarkan apa adanya.
+    Return DataFrame hasil (None jika ResultsStore masih kosong).
+    """
+    if not store.exists():
+        return None
+    rows = store.read()
+
+    frames = {}
+    for ticker in rows["Kode"].dropna():
+        prices = price_store.window(price_store.read(ticker, interval), period)
+        if prices is not None:
+            # Sama seperti StockAnalyzer.technical_analysis (df.dropna())
+            prices = prices.dropna()
+        if prices is not None and not prices.empty:
+            frames[ticker] = prices
+
+    if frames:
+        panel = price_panel(frames)
+        technical = screen_panel(panel["Close"], panel["High"], panel["Low"])
+        technical = technical[list(TECHNICAL_COLUMNS)].rename(columns=TECHNICAL_COLUMNS)
+
+        rows = rows.set_index("Kode")
+        # Kolom kategori → object agar nilai baru bisa ditulis, tipe dipulihkan ResultsStore.write
+        columns = list(TECHNICAL_COLUMNS.values()) + ["trading_recommendation"]
+        rows[columns] = rows[columns].astype(object)
+        rows.loc[technical.index, technical.columns] = technical
+        rows.loc[technical.index, "trading_recommendation"] = (
+            recommend_results(rows.loc[technical.index])["status"]
+        )
+        rows = store.write(rows.reset_index())
+
+    if output:
+        to_csv_frame(rows).to_csv(output, index=False)
+
+    return rows
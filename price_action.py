@@ -0,0 +1,150 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# ===========================================
+# SWING HIGH / LOW (VECTORIZED)
+# ===========================================
+def centered_extreme_flags(values, swing_window, extreme="max"):
+    """
+    Tandai bar yang menjadi nilai ekstrem pada jendela terpusat selebar
+    swing_window*2+1. Hasilnya sama dengan:
+
+        series.rolling(swing_window*2+1, center=True)
+              .apply(lambda x: x[swing_window] == max(x), raw=True)
+
+    yaitu 1.0 / 0.0, dan NaN untuk jendela yang tidak lengkap atau berisi NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    width = swing_window * 2 + 1
+
+    flags = np.full(n, np.nan)
+    if n < width:
+        return flags
+
+    windows = sliding_window_view(values, width)
+    if extreme == "max":
+        target = windows.max(axis=1)
+    else:
+        target = windows.min(axis=1)
+
+    center = values[swing_window:n - swing_window]
+    complete = ~np.isnan(windows).any(axis=1)
+
+    flags[swing_window:n - swing_window] = np.where(
+        complete,
+        (center == target).astype(float),
+        np.nan
+    )
+    return flags
+
+
+def detect_swings(high, low, swing_window=3):
+    """Return (SWING_HIGH, SWING_LOW) sebagai array float 1.0/0.0/NaN"""
+    return (
+        centered_extreme_flags(high, swing_window, "max"),
+        centered_extreme_flags(low, swing_window, "min"),
+    )
+
+
+# ===========================================
+# SUPPLY / DEMAND ZONES (VECTORIZED)
+# ===========================================
+def extract_zones(df, impulse_factor=1.5, last=None):
+    """
+    Cari zona supply/demand dari candle impuls:
+    body candle > impulse_factor * body candle sebelumnya.
+    - impuls naik  → DEMAND (Low .. Open candle sebelumnya)
+    - impuls turun → SUPPLY (Open .. High candle sebelumnya)
+
+    Return (zones, total_zones). `last` membatasi jumlah zona terakhir
+    yang dibentuk menjadi dict.
+    """
+    open_ = df["Open"].to_numpy(dtype=float)
+    high = df["High"].to_numpy(dtype=float)
+    low = df["Low"].to_numpy(dtype=float)
+    close = df["Close"].to_numpy(dtype=float)
+
+    if len(close) < 2:
+        return [], 0
+
+    body = np.abs(close - open_)
+    prev_body = body[:-1]
+    cur_body = body[1:]
+
+    impulse = (prev_body != 0) & (cur_body > impulse_factor * prev_body)
+    demand = impulse & (close[1:] > open_[1:])
+    supply = impulse & (close[1:] < open_[1:])
+
+    # Posisi bar impuls (i), zona diambil dari candle i-1
+    positions = np.flatnonzero(demand | supply) + 1
+    total = len(positions)
+
+    if last is not None:
+        positions = positions[-last:]
+
+    zones = []
+    for i in positions:
+        if demand[i - 1]:
+            zones.append({
+                "type": "DEMAND",
+                "low": low[i - 1],
+                "high": open_[i - 1],
+                "date": df.index[i]
+            })
+        else:
+            zones.append({
+                "type": "SUPPLY",
+                "low": open_[i - 1],
+                "high": high[i - 1],
+                "date": df.index[i]
+            })
+
+    return zones, total
+
+
+# ===========================================
+# MARKET STRUCTURE HH / LH / HL / LL (VECTORIZED)
+# ===========================================
+STRUCTURE_DTYPE = np.dtype([
+    ("pos", np.int64),      # posisi bar (iloc) swing point
+    ("code", "U2"),         # HH / LH / HL / LL
+    ("price", np.float64),  # harga High/Low swing point
+])
+
+
+def _compare_swings(prices, flags, up_code, down_code):
+    # Flag NaN (tepi data) ikut dianggap swing, sama seperti `if flag:`
+    positions = np.flatnonzero(flags != 0)
+    swing_prices = prices[positions]
+
+    codes = np.where(swing_prices[1:] > swing_prices[:-1], up_code, down_code)
+    return positions[1:], codes, swing_prices[1:]
+
+
+def classify_structure(high, low, swing_high, swing_low):
+    """
+    Bandingkan setiap swing point dengan swing sebelumnya yang sejenis:
+    swing high → HH / LH, swing low → HL / LL.
+
+    Return structured array (STRUCTURE_DTYPE) terurut per bar; jika swing high
+    dan swing low jatuh di bar yang sama, swing high lebih dulu.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+
+    h_pos, h_codes, h_prices = _compare_swings(high, np.asarray(swing_high), "HH", "LH")
+    l_pos, l_codes, l_prices = _compare_swings(low, np.asarray(swing_low), "HL", "LL")
+
+    structure = np.empty(len(h_pos) + len(l_pos), dtype=STRUCTURE_DTYPE)
+    structure["pos"] = np.concatenate([h_pos, l_pos])
+    structure["code"] = np.concatenate([h_codes, l_codes]) if len(structure) else []
+    structure["price"] = np.concatenate([h_prices, l_prices])
+
+    # Urut per bar, swing high (0) sebelum swing low (1)
+    kind = np.concatenate([np.zeros(len(h_pos)), np.ones(len(l_pos))])
+    return structure[np.lexsort((kind, structure["pos"]))]
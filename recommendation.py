@@ -0,0 +1,224 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import numpy as np
+import pandas as pd
+
+
+# ===========================================
+# KONSTANTA REKOMENDASI
+# ===========================================
+DEFAULT_RISK_PER_TRADE_PCT = 2
+MIN_RISK_REWARD = 2
+
+STATUS_OK = "LAYAK DITRADINGKAN"
+STATUS_WAIT = "WAIT"
+STATUS_INVALID = "TIDAK LAYAK"
+
+# Kolom input (lihat screen_panel / recommendation_inputs)
+RECOMMENDATION_COLUMNS = [
+    "signal", "trend", "close",
+    "support_1", "support_2", "resistance_1", "resistance_2",
+    "market_structure", "category", "valuation_conclusion",
+]
+
+# Kolom idx_list.csv → kolom input
+RESULT_COLUMNS = {
+    "technical_signal": "signal",
+    "technical_trend": "trend",
+    "technical_close": "close",
+    "technical_support_1": "support_1",
+    "technical_support_2": "support_2",
+    "technical_resistance_1": "resistance_1",
+    "technical_resistance_2": "resistance_2",
+    "price_action_market_structure": "market_structure",
+    "info_category": "category",
+    "valuation_conclusion": "valuation_conclusion",
+}
+
+
+def recommendation_inputs(results):
+    """Satu baris input rekomendasi dari StockAnalyzer.results"""
+    tech = results.get("technical") or {}
+    pa = results.get("price_action") or {}
+    support = tech.get("support") or [None, None]
+    resistance = tech.get("resistance") or [None, None]
+
+    return {
+        "signal": tech.get("signal"),
+        "trend": tech.get("trend"),
+        "close": tech.get("close"),
+        "support_1": support[0],
+        "support_2": support[1],
+        "resistance_1": resistance[0],
+        "resistance_2": resistance[1],
+        "market_structure": pa.get("market_structure"),
+        "category": results.get("info", {}).get("category"),
+        "valuation_conclusion": results.get("valuation", {}).get("valuation_conclusion", "TIDAK DINILAI"),
+    }
+
+
+# ===========================================
+# REKOMENDASI BATCH (VECTORIZED)
+# ===========================================
+def trading_plan_columns(signal, close, support_1, support_2, resistance_1, resistance_2):
+    """Entry / SL / TP1 / TP2 per baris, aturan sama dengan StockAnalyzer._technical_summary"""
+    buy = signal == "BUY"
+    sell = signal == "SELL"
+    has_plan = buy | sell
+
+    entry = np.where(has_plan, close, np.nan)
+    sl = np.select([buy, sell], [support_2, resistance_2], np.nan)
+    tp1 = np.select([buy, sell], [resistance_1, support_1], np.nan)
+    tp2 = np.select([buy, sell], [resistance_2, support_2], np.nan)
+    return entry, sl, tp1, tp2
+
+
+def _column(table, name, default=None):
+    if name in table:
+        return table[name].to_numpy()
+    return np.full(len(table), default, dtype=object)
+
+
+def _float_column(table, name):
+    return pd.to_numeric(table[name], errors="coerce").to_numpy(dtype=float)
+
+
+def recommend_batch(table, risk_per_trade_pct=DEFAULT_RISK_PER_TRADE_PCT, min_rr=MIN_RISK_REWARD):
+    """
+    Rekomendasi trading untuk seluruh universe sekaligus.
+
+    table : DataFrame dengan kolom RECOMMENDATION_COLUMNS (market_structure,
+            category & valuation_conclusion opsional), mis. hasil screen_panel.
+    Return DataFrame: status, reason, entry_price, stop_loss, tp1, tp2,
+    risk_per_share, rr_tp1, rr_tp2, max_risk_pct, rule, notes.
+    """
+    signal = table["signal"].to_numpy(dtype=object)
+    close = _float_column(table, "close")
+    entry, sl, tp1, tp2 = trading_plan_columns(
+        signal,
+        close,
+        _float_column(table, "support_1"),
+        _float_column(table, "support_2"),
+        _float_column(table, "resistance_1"),
+        _float_column(table, "resistance_2"),
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk = np.abs(entry - sl)
+        rr1 = np.abs(tp1 - entry) / risk
+        # TP2 kosong / sama dengan entry → tanpa RR2
+        reward_2 = np.abs(tp2 - entry)
+        rr2 = np.where((reward_2 != 0) & (tp2 != 0), reward_2 / risk, np.nan)
+
+    # Level 0 / kosong dianggap tidak ada (seperti `all([entry, sl, tp1])`)
+    levels = np.vstack([entry, sl, tp1])
+    complete = ((levels != 0) & ~np.isnan(levels)).all(axis=0)
+
+    missing = pd.isna(signal)
+    no_trade = ~missing & (signal == "NO TRADE")
+    incomplete = ~missing & ~no_trade & ~complete
+    zero_risk = ~missing & ~no_trade & complete & (risk == 0)
+    low_rr = ~missing & ~no_trade & complete & (risk != 0) & (rr1 < min_rr)
+    ok = ~(missing | no_trade | incomplete | zero_risk | low_rr)
+
+    status = np.select(
+        [missing, ok],
+        [STATUS_INVALID, STATUS_OK],
+        STATUS_WAIT
+    ).astype(object)
+
+    reason = np.select(
+        [missing, no_trade, incomplete, zero_risk],
+        [
+            "Data teknikal atau price action belum tersedia",
+            "Tidak ada sinyal teknikal yang valid",
+            "Trading plan tidak lengkap",
+            "Risk per share = 0 (entry & SL sama)",
+        ],
+        ""
+    ).astype(object)
+    reason[low_rr] = [f"Risk reward tidak ideal (RR {rr:.2f})" for rr in rr1[low_rr]]
+    reason[ok] = None
+
+    # Catatan kualitas & valuasi (hanya untuk yang layak)
+    category = _column(table, "category")
+    valuation_view = _column(table, "valuation_conclusion", "TIDAK DINILAI")
+    market_structure = _column(table, "market_structure")
+
+    quality_note = np.where(
+        category == "Kecil",
+        "⚠️ Saham kategori kecil, risiko likuiditas lebih tinggi",
+        "Likuiditas relatif aman"
+    )
+    bias_note = np.where(
+        (valuation_view == "SAHAM MAHAL 🔴") & (signal == "BUY"),
+        "⚠️ Secara valuasi saham tergolong mahal",
+        "Valuasi tidak menjadi hambatan utama"
+    )
+
+    notes = np.empty(len(table), dtype=object)
+    for i in np.flatnonzero(ok):
+        notes[i] = [str(quality_note[i]), str(bias_note[i]), f"Market Structure: {market_structure[i]}"]
+
+    def only_ok(values):
+        return np.where(ok, values, np.nan)
+
+    return pd.DataFrame({
+        "status": status,
+        "reason": reason,
+        "entry_price": only_ok(entry),
+        "stop_loss": only_ok(sl),
+        "tp1": only_ok(tp1),
+        "tp2": only_ok(tp2),
+        "risk_per_share": only_ok(np.round(risk, 2)),
+        "rr_tp1": only_ok(np.round(rr1, 2)),
+        "rr_tp2": only_ok(np.round(rr2, 2)),
+        "max_risk_pct": risk_per_trade_pct,
+        "rule": f"Maksimal risiko {risk_per_trade_pct}% dari modal",
+        "notes": notes,
+    }, index=table.index)
+
+
+def recommend_results(results_df, risk_per_trade_pct=DEFAULT_RISK_PER_TRADE_PCT, min_rr=MIN_RISK_REWARD):
+    """Hitung ulang rekomendasi dari tabel hasil screening (kolom idx_list.csv)"""
+    table = results_df.rename(columns=RESULT_COLUMNS)
+    return recommend_batch(table, risk_per_trade_pct, min_rr)
+
+
+def _scalar(value):
+    # Skalar NumPy → tipe Python biasa, NaN → None
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def recommendation_result(row, signal=None, trend=None):
+    """Satu baris hasil recommend_batch → dict results['trading_recommendation']"""
+    if row["status"] != STATUS_OK:
+        return {
+            "status": row["status"],
+            "reason": row["reason"]
+        }
+
+    return {
+        "status": row["status"],
+        "signal": signal,
+        "trend": trend,
+        "entry_price": _scalar(row["entry_price"]),
+        "stop_loss": _scalar(row["stop_loss"]),
+        "take_profit": {
+            "tp1": _scalar(row["tp1"]),
+            "tp2": _scalar(row["tp2"])
+        },
+        "risk_per_share": _scalar(row["risk_per_share"]),
+        "reward": {
+            "rr_tp1": _scalar(row["rr_tp1"]),
+            "rr_tp2": _scalar(row["rr_tp2"])
+        },
+        "risk_management": {
+            "max_risk_pct": _scalar(row["max_risk_pct"]),
+            "rule": row["rule"]
+        },
+        "notes": list(row["notes"])
+    }
@@ -0,0 +1,150 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# ===========================================
+# QUERY LAYER HASIL SCREENING
+# ===========================================
+INDEX_COLUMNS = ("info_sector", "info_category", "trading_recommendation")
+RANGE_COLUMNS = ("fundamental_score", "valuation_score", "info_marketCap")
+
+
+class ResultsQuery:
+    """
+    Index filter di atas tabel hasil screening (read-only).
+
+    - kolom kategori (INDEX_COLUMNS): {nilai: posisi baris} dibangun sekali
+    - kolom numerik (RANGE_COLUMNS): urutan terurut untuk filter rentang
+      dengan binary search
+    - hasil filter di-cache per tuple filter (LRU, `cache_size` entri)
+
+    Contoh:
+        query = ResultsQuery(df)
+        query.filter(equals={"info_sector": "Energy"},
+                     ranges={"fundamental_score": (60, None)})
+    """
+
+    def __init__(self, df, index_columns=INDEX_COLUMNS, range_columns=RANGE_COLUMNS, cache_size=128):
+        self.df = df
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.indexes = {}
+        for column in index_columns:
+            if column in df.columns:
+                groups = df.groupby(df[column], observed=True, dropna=False, sort=False).indices
+                self.indexes[column] = {key: np.asarray(positions) for key, positions in groups.items()}
+
+        self.sorted = {}
+        for column in range_columns:
+            if column in df.columns:
+                values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                valid = np.flatnonzero(~np.isnan(values))
+                order = valid[np.argsort(values[valid], kind="stable")]
+                self.sorted[column] = (values[order], order)
+
+    def options(self, column):
+        """Nilai unik kolom kategori (terurut) untuk pilihan filter"""
+        return sorted(key for key in self.indexes[column] if not pd.isna(key))
+
+    def bounds(self, column):
+        """(min, max) kolom numerik, None jika kosong"""
+        values, _ = self.sorted[column]
+        if len(values) == 0:
+            return None
+        return values[0], values[-1]
+
+    def _equals_positions(self, column, value):
+        return self.indexes[column].get(value, np.empty(0, dtype=np.intp))
+
+    def _range_positions(self, column, low, high):
+        # Rentang tertutup [low, high]; None = tanpa batas
+        values, order = self.sorted[column]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return order[start:stop]
+
+    @staticmethod
+    def filter_key(equals=None, ranges=None):
+        """Tuple filter yang hashable (kunci cache)"""
+        return (
+            tuple(sorted((equals or {}).items())),
+            tuple(sorted((ranges or {}).items())),
+        )
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = compute()
+        result.flags.writeable = False
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def positions(self, equals=None, ranges=None):
+        """Posisi baris (terurut) yang lolos semua filter; di-cache per tuple filter"""
+        key = self.filter_key(equals, ranges)
+
+        def compute():
+            candidates = [self._equals_positions(c, v) for c, v in key[0]]
+            candidates += [self._range_positions(c, *bounds) for c, bounds in key[1]]
+
+            if not candidates:
+                return np.arange(len(self.df))
+
+            # Mulai dari kandidat terkecil agar irisan murah
+            candidates.sort(key=len)
+            result = np.sort(candidates[0])
+            for other in candidates[1:]:
+                result = np.intersect1d(result, other, assume_unique=True)
+            return result
+
+        return self._cached(key, compute)
+
+    def sorted_positions(self, equals=None, ranges=None, sort_by=None, ascending=True):
+        """Posisi hasil filter diurutkan menurut `sort_by` (nilai kosong di akhir); di-cache"""
+        positions = self.positions(equals, ranges)
+        if sort_by is None:
+            return positions
+
+        key = ("sort", self.filter_key(equals, ranges), sort_by, ascending)
+
+        def compute():
+            values = self.df[sort_by].iloc[positions].reset_index(drop=True)
+            order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index
+            return positions[order.to_numpy()]
+
+        return self._cached(key, compute)
+
+    def take(self, positions, columns=None):
+        """Baris `positions` dengan kolom `columns` saja (proyeksi sebelum menyalin data)"""
+        if columns is None:
+            return self.df.iloc[positions]
+        return self.df.iloc[positions, self.df.columns.get_indexer(columns)]
+
+    def page(self, positions, page=1, page_size=50, columns=None):
+        """Satu halaman (mulai dari 1) dari `positions`"""
+        start = (page - 1) * page_size
+        return self.take(positions[start:start + page_size], columns)
+
+    def filter(self, equals=None, ranges=None):
+        """
+        Baris yang lolos filter.
+        equals : {kolom: nilai} untuk INDEX_COLUMNS (None / tidak ada = semua)
+        ranges : {kolom: (min, max)} untuk RANGE_COLUMNS, batas None = terbuka
+        """
+        return self.df.iloc[self.positions(equals, ranges)]
@@ -0,0 +1,279 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import os
+
+import pandas as pd
+
+
+# ===========================================
+# SKEMA HASIL SCREENING
+# ===========================================
+CSV_PATH = "idx_list.csv"
+NOTES_SEPARATOR = "|"
+
+# kolom → dtype (urutan = urutan kolom tabel)
+RESULTS_SCHEMA = {
+    "Kode": "string",
+
+    "info_longName": "string",
+    "info_sector": "category",
+    "info_industry": "category",
+    "info_marketCap": "Int64",
+    "info_category": "category",
+
+    "trading_recommendation": "category",
+
+    "technical_trend": "category",
+    "technical_momentum": "category",
+    "technical_signal": "category",
+    "technical_close": "float64",
+    "technical_support_1": "float64",
+    "technical_support_2": "float64",
+    "technical_resistance_1": "float64",
+    "technical_resistance_2": "float64",
+
+    "price_action_market_structure": "category",
+    "price_action_market_total_zones": "UInt16",
+
+    "fundamental_score": "UInt8",   # 0..100
+    "fundamental_rating": "category",
+
+    "valuation_score": "UInt8",     # 0..100
+    "valuation_conclusion": "category",
+    "valuation_reason": "category",
+    "valuation_notes": "object",  # list[str]
+
+    "info_website": "string",
+}
+
+
+def _notes_list(value):
+    # CSV / checkpoint lama menyimpan catatan sebagai teks "a|b|c"
+    if isinstance(value, str):
+        return [note for note in value.split(NOTES_SEPARATOR) if note]
+    if value is None or (not hasattr(value, "__len__") and pd.isna(value)):
+        return []
+    return list(value)
+
+
+INTEGER_DTYPES = ("Int64", "UInt16", "UInt8")
+
+# dtype yang bisa langsung dipakai pd.read_csv (sisanya dikonversi setelah baca)
+CSV_DTYPES = {
+    column: dtype for column, dtype in RESULTS_SCHEMA.items()
+    if dtype in ("category", "string")
+}
+
+
+def _to_int(series, dtype="Int64"):
+    # Nilai float (mis. 60.0 dari CSV, 1.6e13 market cap) → integer nullable
+    return pd.to_numeric(series, errors="coerce").round().astype(dtype)
+
+
+def results_frame(rows):
+    """
+    Tabel hasil screening bertipe (RESULTS_SCHEMA) dari list baris
+    result_to_row atau DataFrame (mis. hasil baca CSV lama).
+    Kolom di luar skema dipertahankan apa adanya.
+    """
+    df = pd.DataFrame(rows).copy()
+
+    for column, dtype in RESULTS_SCHEMA.items():
+        if column not in df.columns:
+            df[column] = None
+
+        if column == "valuation_notes":
+            df[column] = df[column].map(_notes_list).astype(object)
+        elif dtype in INTEGER_DTYPES:
+            df[column] = _to_int(df[column], dtype)
+        elif dtype == "float64":
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(float)
+        else:
+            df[column] = df[column].astype(dtype)
+
+    extra = [c for c in df.columns if c not in RESULTS_SCHEMA]
+    return df[list(RESULTS_SCHEMA) + extra].reset_index(drop=True)
+
+
+def to_csv_frame(df):
+    """Salinan untuk ekspor CSV: catatan valuasi digabung dengan '|' seperti format lama"""
+    out = df.copy()
+    if "valuation_notes" in out.columns:
+        out["valuation_notes"] = out["valuation_notes"].map(
+            lambda notes: NOTES_SEPARATOR.join(_notes_list(notes))
+        )
+    return out
+
+
+def read_results_csv(path=CSV_PATH):
+    """Baca idx_list.csv langsung dengan dtype skema (kategori tanpa string objek sementara)"""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {column: dtype for column, dtype in CSV_DTYPES.items() if column in header}
+    return results_frame(pd.read_csv(path, dtype=dtypes))
+
+
+def memory_report(df):
+    """Pemakaian memori per kolom (bytes, termasuk isi string/list), terbesar dulu"""
+    usage = df.memory_usage(deep=True, index=True)
+    report = pd.DataFrame({
+        "dtype": [str(df[c].dtype) if c in df.columns else "index" for c in usage.index],
+        "bytes": usage.to_numpy(),
+    }, index=usage.index)
+    return report.sort_values("bytes", ascending=False)
+
+
+def fill_unknown(series, value="Unknown"):
+    """fillna yang juga aman untuk kolom categorical"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+# ===========================================
+# RESULTS STORE (PARQUET + SNAPSHOT HARIAN)
+# ===========================================
+# Kolom yang dibandingkan antar snapshot (lihat ResultsStore.diff)
+DIFF_COLUMNS = [
+    "technical_signal",
+    "technical_trend",
+    "trading_recommendation",
+    "fundamental_score",
+    "valuation_score",
+]
+
+
+def _write_parquet(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _read_parquet(path, columns=None):
+    df = pd.read_parquet(path, columns=columns)
+    if "valuation_notes" in df.columns:
+        # Arrow list → ndarray; kembalikan ke list Python
+        df["valuation_notes"] = df["valuation_notes"].map(_notes_list).astype(object)
+    return df
+
+
+class ResultsStore:
+    """
+    Hasil screening dalam file Parquet bertipe:
+        <root>/latest.parquet                          → hasil terbaru
+        <root>/snapshots/date=YYYY-MM-DD/part.parquet  → satu snapshot per hari
+
+    Kolom categorical & list (valuation_notes) tersimpan apa adanya,
+    sehingga halaman Home tidak perlu parsing teks. Update di hari yang
+    sama menimpa snapshot hari itu.
+    """
+
+    def __init__(self, root="data/results"):
+        self.root = root
+
+    @property
+    def path(self):
+        return os.path.join(self.root, "latest.parquet")
+
+    @property
+    def snapshot_root(self):
+        return os.path.join(self.root, "snapshots")
+
+    def snapshot_path(self, date):
+        return os.path.join(self.snapshot_root, f"date={pd.Timestamp(date):%Y-%m-%d}", "part.parquet")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def write(self, rows, date=None):
+        df = results_frame(rows)
+        date = pd.Timestamp.now() if date is None else date
+
+        _write_parquet(df, self.snapshot_path(date))
+        _write_parquet(df, self.path)
+        return df
+
+    def read(self, columns=None):
+        return _read_parquet(self.path, columns)
+
+    def snapshot_dates(self):
+        """Tanggal snapshot yang tersedia (urut lama → baru)"""
+        if not os.path.isdir(self.snapshot_root):
+            return []
+
+        dates = []
+        for name in os.listdir(self.snapshot_root):
+            path = os.path.join(self.snapshot_root, name, "part.parquet")
+            if name.startswith("date=") and os.path.exists(path):
+                dates.append(pd.Timestamp(name[len("date="):]))
+        return sorted(dates)
+
+    def read_snapshot(self, date, columns=None):
+        """Baca satu partisi tanggal saja (hanya kolom yang diminta)"""
+        return _read_parquet(self.snapshot_path(date), columns)
+
+    def diff(self, old_date, new_date, columns=DIFF_COLUMNS):
+        """
+        Saham yang berubah antara dua snapshot.
+
+        Hanya kolom Kode + `columns` yang dibaca dari kedua partisi, lalu
+        di-join lewat index Kode. Return DataFrame per ticker yang berubah:
+        status ("BARU" / "HILANG" / "BERUBAH"), kolom <kolom>_old / <kolom>_new
+        untuk setiap kolom, <skor>_delta untuk kolom numerik, dan `changed`
+        (daftar kolom yang berubah).
+        """
+        read_columns = ["Kode"] + list(columns)
+        old = self.read_snapshot(old_date, read_columns).set_index("Kode")
+        new = self.read_snapshot(new_date, read_columns).set_index("Kode")
+
+        joined = old.join(new, how="outer", lsuffix="_old", rsuffix="_new")
+        in_old = joined.index.isin(old.index)
+        in_new = joined.index.isin(new.index)
+
+        changed = pd.DataFrame(index=joined.index)
+        for column in columns:
+            before = joined[f"{column}_old"].astype(object)
+            after = joined[f"{column}_new"].astype(object)
+            same = (before == after) | (before.isna() & after.isna())
+            changed[column] = ~same.astype(bool)
+
+        mask = changed.any(axis=1) | ~in_old | ~in_new
+        result = joined[mask].copy()
+
+        result.insert(0, "status", "BERUBAH")
+        result.loc[~in_old[mask], "status"] = "BARU"
+        result.loc[~in_new[mask], "status"] = "HILANG"
+
+        for column in columns:
+            if pd.api.types.is_numeric_dtype(old[column]) and pd.api.types.is_numeric_dtype(new[column]):
+                # Skor disimpan unsigned (UInt8) → hitung selisih dalam Int64/Float64
+                dtype = "Int64" if pd.api.types.is_integer_dtype(old[column]) else "Float64"
+                result[f"{column}_delta"] = (
+                    result[f"{column}_new"].astype(dtype) - result[f"{column}_old"].astype(dtype)
+                )
+
+        flags = changed[mask]
+        result["changed"] = [
+            [column for column, flag in zip(columns, row) if flag]
+            for row in flags.itertuples(index=False)
+        ]
+        return result.reset_index()
+
+    def export_csv(self, path=CSV_PATH, df=None):
+        df = self.read() if df is None else df
+        to_csv_frame(df).to_csv(path, index=False)
+        return path
+
+
+def load_results(store=None, csv_path=CSV_PATH, columns=None):
+    """
+    Baca hasil screening: Parquet dari ResultsStore jika ada,
+    jika belum ada (mis. deploy baru) dari CSV lama lalu dikonversi ke skema.
+    """
+    store = store or ResultsStore()
+    if store.exists():
+        return store.read(columns)
+
+    df = read_results_csv(csv_path)
+    return df[columns] if columns is not None else df
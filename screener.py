@@ -0,0 +1,153 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import argparse
+import sys
+
+import pandas as pd
+
+from market_data import PERIOD_OFFSETS
+from results_store import NOTES_SEPARATOR
+from pipeline import (
+    load_universe, update_screener, recompute_technicals, default_compute_workers,
+    RESULTS_PATH, DEFAULT_RESULTS_STORE
+)
+
+
+# ===========================================
+# CLI SCREENER (TANPA STREAMLIT)
+# ===========================================
+# Contoh (cron):
+#   python -m screener update --total 950 --period 6mo --interval 1d -o idx_list.csv
+#   python -m screener update --from-store          (teknikal saja, tanpa request Yahoo)
+#   python -m screener diff --from 2026-01-05 --to 2026-01-12
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m screener",
+        description="IDX Stock Screener tanpa UI"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="Perbarui data screening (idx_list.csv)")
+    update.add_argument("-n", "--total", type=int, default=950,
+                        help="Jumlah saham yang diproses (default: 950)")
+    update.add_argument("--period", default="6mo", choices=list(PERIOD_OFFSETS) + ["ytd", "max"],
+                        help="Periode data harga (default: 6mo)")
+    update.add_argument("--interval", default="1d", choices=["1d", "1wk"],
+                        help="Interval data harga (default: 1d)")
+    update.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Jumlah pengambilan data bersamaan (default: 8)")
+    update.add_argument("-p", "--processes", type=int, default=default_compute_workers(),
+                        help="Jumlah proses komputasi, 0 = tanpa proses terpisah "
+                             "(default: jumlah core - 1)")
+    update.add_argument("-o", "--output", default=RESULTS_PATH,
+                        help=f"File ekspor CSV (default: {RESULTS_PATH}); hasil bertipe "
+                             f"selalu disimpan ke {DEFAULT_RESULTS_STORE.path}")
+    update.add_argument("--fresh", action="store_true",
+                        help="Abaikan checkpoint dan proses ulang semua saham")
+    update.add_argument("--no-retry-failed", action="store_true",
+                        help="Jangan ulangi saham yang gagal pada checkpoint")
+    update.add_argument("--stale-hours", type=float, default=24,
+                        help="Proses ulang hasil checkpoint yang lebih tua dari N jam (default: 24)")
+    update.add_argument("--from-store", action="store_true",
+                        help="Hitung ulang kolom teknikal & rekomendasi saja dari harga "
+                             "tersimpan (data/prices), tanpa request ke Yahoo")
+
+    diff = commands.add_parser("diff", help="Saham yang berubah antara dua snapshot")
+    diff.add_argument("--from", dest="old_date",
+                      help="Tanggal snapshot lama YYYY-MM-DD (default: snapshot sebelum terakhir)")
+    diff.add_argument("--to", dest="new_date",
+                      help="Tanggal snapshot baru YYYY-MM-DD (default: snapshot terakhir)")
+    diff.add_argument("-o", "--output", help="Simpan hasil ke file CSV")
+    return parser
+
+
+def run_recompute_command(args):
+    df = recompute_technicals(period=args.period, interval=args.interval, output=args.output)
+    if df is None:
+        print(f"ℹ️ Belum ada hasil screening di {DEFAULT_RESULTS_STORE.path}, "
+              f"jalankan update tanpa --from-store dulu", file=sys.stderr)
+        return 1
+
+    print(f"✅ Teknikal {len(df)} saham dihitung ulang, tersimpan ke "
+          f"{DEFAULT_RESULTS_STORE.path} & {args.output}")
+    return 0
+
+
+def run_update_command(args):
+    if args.from_store:
+        return run_recompute_command(args)
+
+    tickers = load_universe(args.total)
+    print(f"📡 Memproses {len(tickers)} saham ({args.period}, {args.interval})")
+
+    def on_plan(from_checkpoint, todo):
+        print(f"📌 {from_checkpoint} saham dari checkpoint, {todo} diproses")
+        if not todo:
+            print(f"ℹ️ Semua hasil checkpoint lebih baru dari {args.stale_hours:g} jam; "
+                  f"pakai --fresh atau --stale-hours lebih kecil untuk memproses ulang")
+
+    def on_result(done, total, ticker, error):
+        if error is not None:
+            print(f"⚠️ {ticker} gagal diproses: {error}", file=sys.stderr)
+        if done == total or done % 50 == 0:
+            print(f"   {done}/{total} selesai")
+
+    def on_summary(summary):
+        print("⏱️ Waktu per tahap:")
+        print(summary.round(3).to_string())
+
+    df_sorted = update_screener(
+        tickers,
+        period=args.period,
+        interval=args.interval,
+        max_workers=args.concurrency,
+        compute_workers=args.processes,
+        output=args.output,
+        resume=not args.fresh,
+        retry_failed=not args.no_retry_failed,
+        stale_after=pd.Timedelta(hours=args.stale_hours),
+        on_plan=on_plan,
+        on_result=on_result,
+        on_summary=on_summary
+    )
+
+    print(f"✅ Update selesai! {len(df_sorted)} saham tersimpan ke "
+          f"{DEFAULT_RESULTS_STORE.path} & {args.output}")
+    return 0
+
+
+def run_diff_command(args):
+    store = DEFAULT_RESULTS_STORE
+    dates = store.snapshot_dates()
+
+    old_date = args.old_date or (dates[-2] if len(dates) >= 2 else None)
+    new_date = args.new_date or (dates[-1] if dates else None)
+    if old_date is None or new_date is None:
+        print("ℹ️ Belum cukup snapshot untuk dibandingkan", file=sys.stderr)
+        return 1
+
+    changes = store.diff(old_date, new_date)
+    print(f"📅 {pd.Timestamp(old_date):%Y-%m-%d} → {pd.Timestamp(new_date):%Y-%m-%d}: "
+          f"{len(changes)} saham berubah")
+
+    if args.output:
+        changes.assign(changed=changes["changed"].str.join(NOTES_SEPARATOR)).to_csv(args.output, index=False)
+    elif not changes.empty:
+        columns = ["Kode", "status"] + [c for c in changes.columns if c.endswith(("_old", "_new"))]
+        print(changes[columns].to_string(index=False))
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "update":
+        return run_update_command(args)
+    if args.command == "diff":
+        return run_diff_command(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
-from core import StockAnalyzer
+from core import StockAnalyzer, run_analysis
+from pipeline import load_universe, update_screener, RESULTS_PATH
+from results_store import ResultsStore, load_results, fill_unknown, to_csv_frame, memory_report
+from results_query import ResultsQuery
 import streamlit as st
 import pandas as pd
 import yfinance as yf
@@ -35,35 +38,7 @@ def safe_get(d, path, default="-"):
     except Exception:
         return default
 
-@st.cache_data(ttl=3600)
-def analyze_stock_x(ticker="ANTM.JK", period="3mo", interval="1d"):
-    """
-    Fungsi utama untuk menjalankan analisis lengkap
-    
-    Parameters:
-    -----------
-    ticker : str
-        Kode saham (contoh: "ANTM.JK", "BMRI.JK")
-    period : str
-        Periode data (contoh: "1mo", "3mo", "6mo", "1y")
-    interval : str
-        Interval data (contoh: "1d", "1h", "15m")
-    """
-    # Inisialisasi analyzer
-    analyzer = StockAnalyzer(ticker=ticker, period=period, interval=interval)
-    
-    # Jalankan semua analisis
-    analyzer.info()
-    analyzer.technical_analysis()
-    analyzer.price_action_analysis()
-    analyzer.fundamental_analysis()
-    analyzer.valuation_analysis()  # Analisis baru
-    analyzer.trading_recommendation()
-    
-    # Generate laporan
-    return analyzer.results
 
-    
 # ==============================
 # Graphical Rendering
 # ==============================
@@ -1316,11 +1291,65 @@ if "selected_ticker" not in st.session_state:
 # ==============================
 # LOAD DATA
 # ==============================
-@st.cache_data
+# Kolom default tabel Home (kolom lain bisa dipilih lewat multiselect)
+TABLE_COLUMNS = [
+    "info_longName",
+    "info_sector",
+    "info_category",
+    "trading_recommendation",
+    "technical_signal",
+    "fundamental_score",
+    "valuation_score",
+    "valuation_conclusion",
+]
+PAGE_SIZES = [25, 50, 100]
+
+
+@st.cache_resource
 def load_data():
-    return pd.read_csv("idx_list.csv")
+    """
+    Satu tabel hasil screening untuk semua sesi (read-only, jangan diubah in-place).
+    Parquet bertipe (ResultsStore), fallback ke idx_list.csv; dtype mengikuti
+    results_store.RESULTS_SCHEMA (kategori, skor UInt8).
+    """
+    df_src = load_results(csv_path=RESULTS_PATH)
+
+    # SAFE COLUMN DEFAULT
+    for col in ["Kode", "info_sector", "info_category", "trading_recommendation"]:
+        if col not in df_src.columns:
+            df_src[col] = None
+
+    # NULL → aman untuk UI
+    df_src["info_sector"] = fill_unknown(df_src["info_sector"])
+    df_src["info_category"] = fill_unknown(df_src["info_category"])
+    df_src["trading_recommendation"] = fill_unknown(df_src["trading_recommendation"])
+
+    return df_src
 
-df = load_data()
+
+@st.cache_resource
+def shared_memory_report():
+    """Pemakaian memori tabel bersama (scan deep sekali per versi data, bukan tiap rerun)"""
+    return memory_report(load_data())
+
+
+@st.cache_resource
+def load_query():
+    """Index filter di atas tabel bersama, dibangun sekali"""
+    return ResultsQuery(load_data())
+
+
+@st.cache_data(max_entries=32)
+def filtered_csv(filter_key):
+    """CSV hasil filter, dibuat sekali per kombinasi filter (bukan tiap rerun)"""
+    equals, ranges = (dict(items) for items in filter_key)
+    df = load_query().filter(equals, ranges)
+    return to_csv_frame(df).to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data
+def load_diff(old_date, new_date):
+    return ResultsStore().diff(old_date, new_date)
 
 
 # ==============================
@@ -1338,23 +1367,13 @@ def get_stock_data(ticker, period, interval):
 # ===========================================
 def analyze_stock(ticker="ANTM.JK", period="3mo", interval="1d"):
 
-    # Inisialisasi analyzer
-    analyzer = StockAnalyzer(ticker=ticker, period=period, interval=interval)
-    
-    # Jalankan semua analisis
-    analyzer.info()
-    analyzer.technical_analysis()
-    analyzer.price_action_analysis()
-    analyzer.fundamental_analysis()
-    analyzer.valuation_analysis()  # Analisis baru
-    
+    # Info, teknikal, price action, fundamental, valuasi & rekomendasi trading
+    analyzer = run_analysis(ticker=ticker, period=period, interval=interval)
     
     # Generate laporan
     #analyzer.print_info()
     #analyzer.generate_report()
     #analyzer.generate_recommendation()
-
-    analyzer.trading_recommendation()
     #analyzer.print_trading_recommendation()
     
     #analyzer.visualize()
@@ -1371,15 +1390,15 @@ with st.sidebar:
 
     menu = st.radio(
         "Navigation",
-        ["🏠 Home", "📌 Detail", "🔄 Update", "ℹ️ About"],
-        index=["Home", "Detail", "Update", "About"].index(st.session_state.page)
+        ["🏠 Home", "📌 Detail", "📅 Perubahan", "🔄 Update", "ℹ️ About"],
+        index=["Home", "Detail", "Perubahan", "Update", "About"].index(st.session_state.page)
     )
 
     st.divider()
     st.caption("📈 Powered by YFinance")
 
 # Sinkronisasi sidebar → state
-st.session_state.page = menu.replace("🏠 ", "").replace("📌 ", "").replace("🔄 ", "").replace("ℹ️ ", "")
+st.session_state.page = menu.replace("🏠 ", "").replace("📌 ", "").replace("📅 ", "").replace("🔄 ", "").replace("ℹ️ ", "")
 
 
 # ==============================
@@ -1395,37 +1414,21 @@ if st.session_state.page == "Home":
     col_reload, col_space = st.columns([1, 5])
     with col_reload:
         if st.button("🔄 Reload Data"):
-            load_data.clear()   # clear cache @st.cache_data
+            load_data.clear()   # clear cache @st.cache_resource
+            load_query.clear()  # index filter dibangun ulang
+            shared_memory_report.clear()
+            filtered_csv.clear()
             st.rerun()
 
     # ==============================
-    # LOAD DATA
+    # LOAD DATA (+ INDEX FILTER)
     # ==============================
     try:
-        df_src = load_data()
+        query = load_query()
     except Exception:
-        st.error("❌ Gagal memuat data idx_list.csv")
+        st.error("❌ Gagal memuat data hasil screening")
         st.stop()
 
-    # ==============================
-    # SAFE COLUMN DEFAULT
-    # ==============================
-    safe_cols = [
-        "Kode",
-        "info_sector",
-        "info_category",
-        "trading_recommendation"
-    ]
-
-    for col in safe_cols:
-        if col not in df_src.columns:
-            df_src[col] = None
-
-    # NULL → aman untuk UI
-    df_src["info_sector"] = df_src["info_sector"].fillna("Unknown")
-    df_src["info_category"] = df_src["info_category"].fillna("Unknown")
-    df_src["trading_recommendation"] = df_src["trading_recommendation"].fillna("Unknown")
-
     # ==============================
     # FILTER UI
     # ==============================
@@ -1437,96 +1440,144 @@ if st.session_state.page == "Home":
         with col1:
             sector = st.selectbox(
                 "Sector",
-                ["All"] + sorted(df_src["info_sector"].unique())
+                ["All"] + query.options("info_sector")
             )
 
         with col2:
             category = st.selectbox(
                 "Category",
-                ["All"] + sorted(df_src["info_category"].unique())
+                ["All"] + query.options("info_category")
             )
 
         with col3:
             recommendation = st.selectbox(
                 "Recommendation",
-                ["All"] + sorted(df_src["trading_recommendation"].unique())
+                ["All"] + query.options("trading_recommendation")
             )
 
+        col4, col5, col6 = st.columns(3)
+
+        with col4:
+            fundamental_range = st.slider("Fundamental Score", 0, 100, (0, 100))
+
+        with col5:
+            valuation_range = st.slider("Valuation Score", 0, 100, (0, 100))
+
+        with col6:
+            TRILLION = 1_000_000_000_000
+            cap_bounds = query.bounds("info_marketCap") or (0, 0)
+            cap_max = max(1, math.ceil(cap_bounds[1] / TRILLION))
+            cap_range = st.slider("Market Cap (Triliun)", 0, cap_max, (0, cap_max))
+
     # ==============================
-    # FILTER LOGIC (NULL SAFE)
+    # FILTER LOGIC (INDEX, NULL SAFE)
     # ==============================
-    filtered_df = df_src.copy()
-
+    equals = {}
     if sector != "All":
-        filtered_df = filtered_df[filtered_df["info_sector"] == sector]
-
+        equals["info_sector"] = sector
     if category != "All":
-        filtered_df = filtered_df[filtered_df["info_category"] == category]
-
+        equals["info_category"] = category
     if recommendation != "All":
-        filtered_df = filtered_df[
-            filtered_df["trading_recommendation"] == recommendation
-        ]
+        equals["trading_recommendation"] = recommendation
+
+    # Rentang penuh = tanpa filter (saham tanpa data tetap tampil)
+    ranges = {}
+    if fundamental_range != (0, 100):
+        ranges["fundamental_score"] = fundamental_range
+    if valuation_range != (0, 100):
+        ranges["valuation_score"] = valuation_range
+    if cap_range != (0, cap_max):
+        ranges["info_marketCap"] = (cap_range[0] * TRILLION, cap_range[1] * TRILLION)
+
+    positions = query.positions(equals, ranges)
+    total_rows = len(positions)
 
     # ==============================
     # METRICS
     # ==============================
     col1, col2, col3 = st.columns(3)
 
-    col1.metric("📊 Total Saham", len(filtered_df))
+    col1.metric("📊 Total Saham", total_rows)
 
     col2.metric(
         "🏭 Sector",
-        filtered_df["info_sector"].nunique()
-        if not filtered_df.empty else 0
+        query.take(positions, ["info_sector"])["info_sector"].nunique()
+        if total_rows else 0
     )
 
     col3.metric(
         "⭐ Rekomendasi",
-        filtered_df["trading_recommendation"].nunique()
-        if not filtered_df.empty else 0
+        query.take(positions, ["trading_recommendation"])["trading_recommendation"].nunique()
+        if total_rows else 0
     )
 
     st.divider()
 
     # ==============================
-    # TABLE + DETAIL
+    # TABLE + DETAIL (PER HALAMAN)
     # ==============================
     st.subheader("📋 Daftar Saham")
 
-    if filtered_df.empty:
+    page_df = None
+
+    if total_rows == 0:
         st.warning("⚠️ Tidak ada data sesuai filter")
     else:
-        table_df = filtered_df.copy()
-        table_df["🔎 Detail"] = False
+        all_columns = [c for c in query.df.columns if c != "Kode"]
+
+        col1, col2, col3, col4 = st.columns([4, 2, 1, 1])
+        with col1:
+            columns = st.multiselect(
+                "🧾 Kolom",
+                all_columns,
+                default=[c for c in TABLE_COLUMNS if c in all_columns]
+            )
+        with col2:
+            sort_by = st.selectbox(
+                "↕️ Urutkan",
+                ["Kode"] + all_columns,
+                index=(["Kode"] + all_columns).index("fundamental_score")
+                if "fundamental_score" in all_columns else 0
+            )
+        with col3:
+            descending = st.toggle("Menurun", value=True)
+        with col4:
+            page_size = st.selectbox("Baris", PAGE_SIZES, index=1)
+
+        n_pages = math.ceil(total_rows / page_size)
+        # Key ikut jumlah hasil & ukuran halaman → kembali ke halaman 1 saat filter berubah
+        page = st.number_input(
+            f"Halaman (dari {n_pages})",
+            min_value=1,
+            max_value=n_pages,
+            value=1,
+            key=f"table_page_{total_rows}_{page_size}"
+        )
 
-        column_order = ["🔎 Detail"] + [
-            c for c in table_df.columns if c != "🔎 Detail"
-        ]
+        # Urut & potong di index; hanya baris + kolom halaman ini yang dikirim ke browser
+        sorted_positions = query.sorted_positions(equals, ranges, sort_by, ascending=not descending)
+        page_df = query.page(sorted_positions, page, page_size, ["Kode"] + columns)
 
-        edited_df = st.data_editor(
-            table_df,
+        event = st.dataframe(
+            page_df,
             hide_index=True,
             width="stretch",
-            height=500,
-            column_order=column_order,
-            column_config={
-                "🔎 Detail": st.column_config.CheckboxColumn(
-                    "Detail",
-                    help="Klik untuk melihat detail saham",
-                    width="small"
-                )
-            },
-            disabled=[c for c in table_df.columns if c != "🔎 Detail"],
+            on_select="rerun",
+            selection_mode="single-row",
+            key="screener_table"
+        )
+        st.caption(
+            f"Baris {(page - 1) * page_size + 1}–{(page - 1) * page_size + len(page_df)} "
+            f"dari {total_rows} · pilih baris untuk melihat detail"
         )
 
         # ==============================
-        # HANDLE CLICK DETAIL (SAFE)
+        # HANDLE PILIH BARIS → DETAIL
         # ==============================
-        clicked = edited_df[edited_df["🔎 Detail"] == True]
+        selected_rows = event.selection.rows
 
-        if not clicked.empty:
-            ticker = clicked.iloc[0].get("Kode")
+        if selected_rows:
+            ticker = page_df.iloc[selected_rows[0]]["Kode"]
 
             if pd.notna(ticker):
                 st.session_state.selected_ticker = ticker
@@ -1540,17 +1591,29 @@ if st.session_state.page == "Home":
     # ==============================
     st.subheader("⬇️ Download Data")
 
-    if not filtered_df.empty:
-        csv = filtered_df.to_csv(index=False).encode("utf-8")
+    if total_rows:
         st.download_button(
             "⬇️ Download CSV",
-            csv,
+            filtered_csv(query.filter_key(equals, ranges)),
             "idx_stock_screener.csv",
             "text/csv"
         )
     else:
         st.info("Tidak ada data untuk di-download")
 
+    # ==============================
+    # MEMORI (TABEL BERSAMA VS SESI INI)
+    # ==============================
+    with st.expander("💾 Pemakaian Memori"):
+        shared_report = shared_memory_report()
+        session_bytes = positions.nbytes
+        if page_df is not None:
+            session_bytes += memory_report(page_df)["bytes"].sum()
+
+        col1, col2 = st.columns(2)
+        col1.metric("Tabel bersama (semua sesi)", f"{shared_report['bytes'].sum() / 1024:,.0f} KB")
+        col2.metric("Sesi ini (halaman tabel)", f"{session_bytes / 1024:,.0f} KB")
+        st.dataframe(shared_report, use_container_width=True)
 
 
 # ==============================
@@ -1594,6 +1657,39 @@ elif st.session_state.page == "Detail":
         except Exception:
             st.error("🚦 Terlalu banyak request ke Yahoo Finance. Coba lagi nanti.")
 
+# ==============================
+# PERUBAHAN ANTAR SNAPSHOT
+# ==============================
+elif menu == "📅 Perubahan":
+    st.markdown("# 📅 Perubahan Screening")
+    st.caption("Saham yang berubah sinyal, trend, rekomendasi atau skor antar tanggal update")
+
+    dates = [d.strftime("%Y-%m-%d") for d in ResultsStore().snapshot_dates()]
+
+    if len(dates) < 2:
+        st.info("ℹ️ Belum cukup snapshot. Jalankan Update minimal di dua hari berbeda.")
+    else:
+        with st.container(border=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                old_date = st.selectbox("Dari tanggal", dates, index=len(dates) - 2)
+            with col2:
+                new_date = st.selectbox("Sampai tanggal", dates, index=len(dates) - 1)
+
+        changes = load_diff(old_date, new_date)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🔁 Berubah", int((changes["status"] == "BERUBAH").sum()))
+        col2.metric("🆕 Baru", int((changes["status"] == "BARU").sum()))
+        col3.metric("🗑️ Hilang", int((changes["status"] == "HILANG").sum()))
+
+        st.divider()
+
+        if changes.empty:
+            st.success("✅ Tidak ada perubahan")
+        else:
+            st.dataframe(changes, hide_index=True, use_container_width=True)
+
 # ==============================
 # UPDATE
 # ==============================
@@ -1603,7 +1699,7 @@ elif menu == "🔄 Update":
 
     with st.container(border=True):
         with st.form("update_form"):
-            col0, col1, col2, col3 = st.columns([3,3, 3, 1])
+            col0, col1, col2, col3, col4 = st.columns([3, 3, 3, 2, 1])
             with col0:
                 total_stocks = st.number_input(
                     "Total Saham yang Ingin Diproses",
@@ -1619,98 +1715,104 @@ elif menu == "🔄 Update":
                 interval = st.selectbox("Interval", ["1d", "1wk"], index=0)
 
             with col3:
+                max_workers = st.number_input(
+                    "Concurrency",
+                    min_value=1,
+                    max_value=32,
+                    value=8,
+                    step=1,
+                    help="Jumlah saham yang dianalisis bersamaan"
+                )
+
+            with col4:
                 update_btn = st.form_submit_button("🔄 Update")
 
+            col5, col6, col7 = st.columns([3, 3, 3])
+            with col5:
+                fresh = st.checkbox(
+                    "Mulai dari awal (abaikan checkpoint)",
+                    value=False,
+                    help="Sama seperti --fresh di CLI. Tanpa ini, saham yang sudah "
+                         "selesai dan belum kedaluwarsa diambil dari checkpoint"
+                )
+
+            with col6:
+                retry_failed = st.checkbox("Ulangi saham yang gagal", value=True)
+
+            with col7:
+                stale_hours = st.number_input(
+                    "Proses ulang jika lebih tua dari (jam)",
+                    min_value=1,
+                    max_value=24 * 30,
+                    value=24,
+                    step=1
+                )
+
     if update_btn:
         try:
             with st.spinner("📡 Mengambil & menganalisis data saham..."):
-                idx_url = "https://raw.githubusercontent.com/wildangunawan/Dataset-Saham-IDX/master/List%20Emiten/all.csv"
+                tickers = load_universe(total_stocks)
 
-                idx = pd.read_csv(idx_url).head(total_stocks)
-                tickers = idx["code"].dropna().unique()
-                tickers = [f"{t}.JK" for t in tickers]
-
-                results = []
+                plan_info = st.empty()
                 progress = st.progress(0)
+                plan = {}
 
-                for i, ticker in enumerate(tickers):
-                    try:
-                        data = analyze_stock_x(
-                            ticker=ticker,
-                            period=period,
-                            interval=interval
-                        )
-                        results.append({
-                            "Kode": ticker,
-
-                            "info_longName": data["info"].get("longName"),
-                            "info_sector": data["info"].get("sector"),
-                            "info_industry": data["info"].get("industry"),
-                            "info_marketCap": data["info"].get("marketCap"),
-                            "info_category": data["info"].get("category"),
-
-                            "trading_recommendation": data["trading_recommendation"].get("status"),
-
-                            "technical_trend": data["technical"].get("trend"),
-                            "technical_momentum": data["technical"].get("momentum"),
-                            "technical_signal": data["technical"].get("signal"),
-
-                            "price_action_market_structure": data["price_action"].get("market_structure"),
-                            "price_action_market_total_zones": data["price_action"].get("total_zones"),
-
-                            "fundamental_score": data["fundamental"].get("score"),
-                            "fundamental_rating": data["fundamental"].get("rating"),
-
-                            "valuation_score": data["valuation"].get("valuation_score"),
-                            "valuation_conclusion": data["valuation"].get("valuation_conclusion"),
-                            "valuation_reason": data["valuation"].get("valuation_reason"),
-                            "valuation_notes": "|".join(
-                                data["valuation"].get("valuation_notes", [])
-                            ),
-
-                            "info_website": data["info"].get("website"),
-                        })
-
-                    except Exception as e:
-                        # Jika error per saham → tetap lanjut
-                        results.append({
-                            "Kode": ticker,
-
-                            "technical_trend": None,
-                            "technical_momentum": None,
-                            "technical_signal": None,
-
-                            "price_action_market_structure": None,
-                            "price_action_market_total_zones": None,
-
-                            "fundamental_score": None,
-                            "fundamental_rating": None,
-
-                            "valuation_score": None,
-                            "valuation_conclusion": None,
-                            "valuation_reason": None,
-                            "valuation_notes": None,
-                        })
+                def on_plan(from_checkpoint, todo):
+                    plan.update(from_checkpoint=from_checkpoint, todo=todo)
+                    plan_info.info(f"📌 {from_checkpoint} saham dari checkpoint, {todo} diproses")
+                    if not todo:
+                        progress.progress(1.0)
 
+                def on_result(done, total, ticker, error):
+                    if error is not None:
                         st.warning(f"⚠️ {ticker} gagal diproses")
-
-                    progress.progress((i + 1) / len(tickers))
-
-                screened = pd.DataFrame(results)
-
-                df_sorted = screened.sort_values(
-                    by="fundamental_score",
-                    ascending=False
+                    progress.progress(done / total)
+
+                summaries = []
+
+                df_sorted = update_screener(
+                    tickers,
+                    period=period,
+                    interval=interval,
+                    max_workers=max_workers,
+                    # Tanpa process pool: proses spawn akan mengimpor ulang
+                    # streamlit_app.py (__main__) dan menjalankan seluruh halaman
+                    compute_workers=0,
+                    output=RESULTS_PATH,
+                    resume=not fresh,
+                    retry_failed=retry_failed,
+                    stale_after=pd.Timedelta(hours=stale_hours),
+                    on_plan=on_plan,
+                    on_result=on_result,
+                    on_summary=summaries.append
                 )
 
-                df_sorted.to_csv("idx_list.csv", index=False)
-
-            st.success("✅ Update selesai! Data tersimpan ke idx_list.csv")
+            load_data.clear()
+            load_query.clear()
+            shared_memory_report.clear()
+            filtered_csv.clear()
+            load_diff.clear()   # snapshot hari ini bisa berubah
+            st.success(
+                f"✅ Update selesai! {plan.get('todo', 0)} saham diproses, "
+                f"{plan.get('from_checkpoint', 0)} dari checkpoint. "
+                "Data tersimpan (Parquet & idx_list.csv)"
+            )
+            if plan and not plan["todo"]:
+                st.warning(
+                    f"⚠️ Tidak ada saham yang diproses: semua hasil checkpoint masih lebih "
+                    f"baru dari {stale_hours} jam. Centang \"Mulai dari awal\" atau "
+                    "perkecil batas jam untuk mengambil data terbaru."
+                )
 
             # Preview hasil
             st.subheader("📊 Preview Top 20 Saham")
             st.dataframe(df_sorted.head(20), use_container_width=True)
 
+            # Waktu per tahap (fetch / analisis) untuk saham yang diproses
+            if summaries:
+                with st.expander("⏱️ Waktu per Tahap"):
+                    st.dataframe(summaries[0], use_container_width=True)
+
         except Exception as e:
             st.error("🚦 Terlalu banyak request ke Yahoo Finance. Coba lagi nanti.")
             st.caption(str(e))
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modul aplikasi ada langsung di root repo (bukan package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_ohlcv(seed=0, n=130, end=None):
+    """OHLCV harian sintetis (random walk) untuk pengujian"""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end)
+    index = pd.date_range(end=end, periods=n, freq="B", name="Date")
+    close = np.round(1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+    open_ = np.round(close * (1 + rng.normal(0, 0.01, n)))
+    high = np.round(np.maximum(open_, close) * (1 + rng.random(n) * 0.02))
+    low = np.round(np.minimum(open_, close) * (1 - rng.random(n) * 0.02))
+    volume = rng.integers(100_000, 10_000_000, n).astype(float)
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index
+    )
+
+
+@pytest.fixture
+def make_ohlcv():
+    return random_ohlcv
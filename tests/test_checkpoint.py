@@ -0,0 +1,23 @@
+from pipeline import UpdateCheckpoint
+
+
+def test_compact_keeps_latest_record_per_ticker(tmp_path):
+    checkpoint = UpdateCheckpoint(root=str(tmp_path))
+
+    # Tiga kali update untuk dua saham
+    for run in range(3):
+        checkpoint.append("AAA.JK", {"Kode": "AAA", "run": run})
+        checkpoint.append("BBB.JK", {"Kode": "BBB", "run": run}, ok=run != 2)
+
+    records = checkpoint.compact()
+
+    with open(checkpoint.path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert checkpoint.load() == records
+    assert records["AAA.JK"]["row"]["run"] == 2
+    assert records["BBB.JK"]["status"] == "failed"
+
+
+def test_compact_without_file_is_noop(tmp_path):
+    checkpoint = UpdateCheckpoint(root=str(tmp_path))
+    assert checkpoint.compact() == {}
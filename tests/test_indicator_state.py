@@ -0,0 +1,172 @@
+import json
+
+import numpy as np
+import pytest
+
+from core import StockAnalyzer
+from indicators import IndicatorState, indicator_set, tail_levels
+from market_data import IndicatorStateStore
+
+
+def full_snapshot(df):
+    """Nilai bar terakhir dari hitung ulang penuh (indicator_set + tail_levels)"""
+    result = {name: values[-1] for name, values in indicator_set(df["Close"].to_numpy()).items()}
+    support, resistance = tail_levels(df["High"].to_numpy(), df["Low"].to_numpy(), [10, 30])
+    result["support"] = support
+    result["resistance"] = resistance
+    return result
+
+
+def assert_snapshot_equal(actual, expected):
+    assert set(actual) == set(expected)
+    for name in expected:
+        np.testing.assert_allclose(actual[name], expected[name], rtol=1e-9, err_msg=name)
+
+
+def round_trip(state):
+    return IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+
+def from_frame(df):
+    return IndicatorState.from_history(df["Close"], df["High"], df["Low"], dates=df.index)
+
+
+def resume_frame(state, df):
+    return state.resume(df.index, df["Close"], df["High"], df["Low"])
+
+
+# ===========================================
+# INKREMENTAL VS HITUNG ULANG PENUH
+# ===========================================
+def test_resume_with_new_bars_matches_full_recompute(make_ohlcv):
+    df = make_ohlcv(seed=1, n=130)
+    state = round_trip(from_frame(df.iloc[:100]))
+
+    resumed = resume_frame(state, df)
+
+    assert resumed is not None
+    assert resumed.count == len(df)
+    assert resumed.last_date == df.index[-1]
+    assert_snapshot_equal(resumed.snapshot(), full_snapshot(df))
+
+
+@pytest.mark.parametrize("window", [21, 63, 126])
+def test_daily_runs_over_sliding_window_match_full_recompute(make_ohlcv, window):
+    # Update harian dengan period tetap (1mo / 3mo / 6mo): jendela bergeser satu bar
+    df = make_ohlcv(seed=9, n=window + 40)
+    state = None
+
+    for end in range(window, len(df) + 1):
+        bars = df.iloc[end - window:end]
+        resumed = resume_frame(state, bars) if state is not None else None
+        if end > window:
+            assert resumed is None
+        state = round_trip(resumed or from_frame(bars))
+
+        assert_snapshot_equal(state.snapshot(), full_snapshot(bars))
+
+
+def test_resume_same_window_start_within_day(make_ohlcv):
+    # Update diulang di hari yang sama: awal jendela tetap, bar terakhir bertambah
+    df = make_ohlcv(seed=10, n=70)
+    state = round_trip(from_frame(df.iloc[:69]))
+
+    resumed = resume_frame(state, df)
+
+    assert resumed is not None
+    assert resumed.first_date == df.index[0]
+    assert_snapshot_equal(resumed.snapshot(), full_snapshot(df))
+
+
+def test_resume_revised_last_bar_uses_previous_state(make_ohlcv):
+    df = make_ohlcv(seed=2, n=80)
+    state = round_trip(from_frame(df))
+
+    # Candle terakhir belum final saat disimpan → harganya berubah
+    revised = df.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] += 7
+    revised.iloc[-1, revised.columns.get_loc("High")] += 7
+
+    resumed = resume_frame(state, revised)
+
+    assert resumed is not None
+    assert resumed.count == len(df)
+    assert_snapshot_equal(resumed.snapshot(), full_snapshot(revised))
+
+
+def test_resume_returns_none_after_price_adjustment(make_ohlcv):
+    df = make_ohlcv(seed=3, n=80)
+    state = from_frame(df.iloc[:60])
+
+    # Split 1:2 → seluruh riwayat di-adjust ulang
+    adjusted = df.copy()
+    adjusted[["Open", "High", "Low", "Close"]] /= 2
+
+    assert resume_frame(state, adjusted) is None
+    # Bar terakhir & sebelumnya hilang dari riwayat
+    assert resume_frame(state, df.drop(df.index[58:60])) is None
+
+
+def test_resume_with_timezone_index(make_ohlcv):
+    df = make_ohlcv(seed=4, n=60).tz_localize("Asia/Jakarta")
+    state = round_trip(from_frame(df.iloc[:50]))
+
+    resumed = resume_frame(state, df)
+
+    assert resumed is not None
+    assert resumed.count == len(df)
+    assert_snapshot_equal(resumed.snapshot(), full_snapshot(df))
+
+
+def test_indicator_state_store_round_trip(tmp_path, make_ohlcv):
+    store = IndicatorStateStore(tmp_path)
+    state = from_frame(make_ohlcv(seed=5, n=40))
+
+    assert store.read("BBCA.JK", "6mo", "1d") is None
+    store.write("BBCA.JK", "6mo", "1d", state.to_dict())
+
+    assert store.read("BBCA.JK", "6mo", "1d") == json.loads(json.dumps(state.to_dict()))
+    assert store.read("BBCA.JK", "1y", "1d") is None
+
+
+# ===========================================
+# StockAnalyzer.update_technical
+# ===========================================
+def analyzed(df, **kwargs):
+    analyzer = StockAnalyzer("TEST.JK", price_data=df, price_store=None, **kwargs)
+    analyzer.technical_analysis()
+    return analyzer
+
+
+def test_incremental_technical_analysis_matches_full(make_ohlcv):
+    df = make_ohlcv(seed=6, n=130)
+    full = analyzed(df)
+    cold = analyzed(df, incremental=True)
+    warm = analyzed(df, incremental=True, indicator_state=round_trip(from_frame(df.iloc[:120])))
+
+    assert cold.results["technical"] == full.results["technical"]
+    assert warm.results["technical"] == full.results["technical"]
+    assert warm.indicator_state.count == len(df)
+
+
+def test_update_technical_dict_bar_matches_full(make_ohlcv):
+    df = make_ohlcv(seed=7, n=131)
+    analyzer = analyzed(df.iloc[:130])
+    bar = df.iloc[-1]
+
+    analyzer.update_technical(bar.to_dict(), date=bar.name)
+
+    assert analyzer.df.index[-1] == bar.name
+    assert analyzer.results["technical"] == analyzed(df).results["technical"]
+
+
+def test_update_technical_without_date_leaves_state_untouched(make_ohlcv):
+    df = make_ohlcv(seed=8, n=60)
+    analyzer = analyzed(df.iloc[:59], incremental=True)
+    before = analyzer.indicator_state.to_dict()
+
+    with pytest.raises(ValueError):
+        analyzer.update_technical(df.iloc[-1].to_dict())
+
+    assert len(analyzer.df) == 59
+    assert analyzer.indicator_state.to_dict() == before
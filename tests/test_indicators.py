@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import bollinger, ema, indicator_set, macd, rsi
+
+
+# ===========================================
+# NILAI YANG DIKETAHUI (DIHITUNG MANUAL)
+# ===========================================
+def test_ema_known_values():
+    # alpha = 2 / (3 + 1) = 0.5, diawali nilai pertama, NaN sebelum 3 observasi
+    result = ema([1.0, 2.0, 3.0, 4.0, 5.0], 3)
+    np.testing.assert_allclose(result, [np.nan, np.nan, 2.25, 3.125, 4.0625])
+
+
+def test_rsi_known_values():
+    # Naik terus → tidak ada rata-rata turun → RSI 100
+    np.testing.assert_allclose(rsi(np.arange(1.0, 21.0), 14)[13:], 100.0)
+
+    # Naik 1 lalu turun 1 bergantian, window 2 (alpha 0.5):
+    # diff = [0, 1, -1, 1] → avg_up = [0, .5, .25, .625], avg_down = [0, 0, .5, .25]
+    result = rsi([1.0, 2.0, 1.0, 2.0], 2)
+    expected = [np.nan, 100.0, 100 - 100 / (1 + 0.25 / 0.5), 100 - 100 / (1 + 0.625 / 0.25)]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_macd_of_constant_series_is_zero():
+    line, signal = macd(np.full(40, 500.0))
+    assert np.isnan(line[:25]).all()
+    np.testing.assert_allclose(line[25:], 0.0)
+    assert np.isnan(signal[:33]).all()
+    np.testing.assert_allclose(signal[33:], 0.0)
+
+
+def test_bollinger_known_values():
+    # Jendela [1, 2, 3]: mean 2, std populasi sqrt(2/3)
+    upper, lower = bollinger([1.0, 2.0, 3.0], window=3, window_dev=2)
+    np.testing.assert_allclose(upper, [np.nan, np.nan, 2 + 2 * np.sqrt(2 / 3)])
+    np.testing.assert_allclose(lower, [np.nan, np.nan, 2 - 2 * np.sqrt(2 / 3)])
+
+
+# ===========================================
+# DEFINISI REFERENSI (RUMUS pandas YANG DIPAKAI ta)
+# ===========================================
+def reference(close):
+    close = pd.Series(close)
+
+    def ewm_span(series, span):
+        return series.ewm(span=span, min_periods=span, adjust=False).mean()
+
+    diff = close.diff()
+    up = diff.where(diff > 0, 0.0)
+    down = -diff.where(diff < 0, 0.0)
+    avg_up = up.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    avg_down = down.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+
+    line = ewm_span(close, 12) - ewm_span(close, 26)
+    mavg = close.rolling(20, min_periods=20).mean()
+    mstd = close.rolling(20, min_periods=20).std(ddof=0)
+
+    result = {f"EMA_{w}": ewm_span(close, w) for w in (5, 9, 20, 50)}
+    result["RSI"] = pd.Series(np.where(avg_down == 0, 100.0, 100 - 100 / (1 + avg_up / avg_down)))
+    result["RSI"][avg_up.isna()] = np.nan
+    result["MACD"] = line
+    result["MACD_SIGNAL"] = ewm_span(line, 9)
+    result["BB_UPPER"] = mavg + 2 * mstd
+    result["BB_LOWER"] = mavg - 2 * mstd
+    return result
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_indicator_set_matches_reference(make_ohlcv, seed):
+    close = make_ohlcv(seed=seed, n=200)["Close"].to_numpy()
+    result = indicator_set(close)
+
+    for name, expected in reference(close).items():
+        np.testing.assert_allclose(result[name], expected.to_numpy(), rtol=1e-10, err_msg=name)
+
+
+# ===========================================
+# CROSS-CHECK LANGSUNG DENGAN ta (requirements-dev.txt)
+# ===========================================
+def ta_reference(close):
+    ta = pytest.importorskip("ta")
+    close = pd.Series(close)
+    macd_ta = ta.trend.MACD(close, window_slow=26, window_fast=12, window_sign=9)
+    bands = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+
+    result = {f"EMA_{w}": ta.trend.EMAIndicator(close, window=w).ema_indicator() for w in (5, 9, 20, 50)}
+    result["RSI"] = ta.momentum.RSIIndicator(close, window=14).rsi()
+    result["MACD"] = macd_ta.macd()
+    result["MACD_SIGNAL"] = macd_ta.macd_signal()
+    result["BB_UPPER"] = bands.bollinger_hband()
+    result["BB_LOWER"] = bands.bollinger_lband()
+    return result
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_indicator_set_matches_ta(make_ohlcv, seed):
+    close = make_ohlcv(seed=seed, n=200)["Close"].to_numpy()
+    result = indicator_set(close)
+
+    for name, expected in ta_reference(close).items():
+        np.testing.assert_allclose(result[name], expected.to_numpy(), rtol=1e-10, err_msg=name)
+
+
+def test_panel_columns_match_single_series(make_ohlcv):
+    # Kolom kedua diawali NaN (saham baru listing)
+    a = make_ohlcv(seed=3, n=120)["Close"].to_numpy()
+    b = make_ohlcv(seed=4, n=120)["Close"].to_numpy(copy=True)
+    b[:30] = np.nan
+    panel = indicator_set(np.column_stack([a, b]))
+
+    for column, close in enumerate([a, b]):
+        single = indicator_set(close[~np.isnan(close)])
+        for name, values in panel.items():
+            np.testing.assert_allclose(values[~np.isnan(close), column], single[name], rtol=1e-10, err_msg=name)
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+import market_data
+from market_data import PRICE_COLUMNS, PriceStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    # max_age 0: data tersimpan selalu dicek ulang ke Yahoo
+    return PriceStore(root=str(tmp_path), max_age=pd.Timedelta(0))
+
+
+def assert_same_bars(left, right):
+    pd.testing.assert_frame_equal(left, right, check_freq=False)
+
+
+def test_incremental_append_refetches_last_two_bars(store, make_ohlcv):
+    bars = make_ohlcv(n=60)
+    store.replace("AAA.JK", "1d", bars.iloc[:50])
+
+    mode, start = store.plan("AAA.JK", "1mo", "1d")
+    assert mode == "incremental"
+    assert start == bars.index[48]
+
+    merged = store.append("AAA.JK", "1d", bars.iloc[48:])
+    assert_same_bars(merged, bars)
+    assert_same_bars(store.read("AAA.JK", "1d"), bars)
+
+
+def test_unfinished_last_bar_is_replaced(store, make_ohlcv):
+    bars = make_ohlcv(n=60)
+    store.replace("AAA.JK", "1d", bars.iloc[:50])
+
+    # Bar terakhir tersimpan masih candle berjalan → boleh berubah
+    revised = bars.iloc[48:].copy()
+    revised.iloc[1, revised.columns.get_loc("Close")] += 5
+
+    merged = store.append("AAA.JK", "1d", revised)
+    assert merged.loc[bars.index[49], "Close"] == bars.loc[bars.index[49], "Close"] + 5
+
+
+def test_adjusted_overlap_is_rejected(store, make_ohlcv):
+    bars = make_ohlcv(n=60)
+    store.replace("AAA.JK", "1d", bars.iloc[:50])
+
+    # Split 2:1 → Yahoo meng-adjust seluruh riwayat
+    adjusted = bars.copy()
+    adjusted[PRICE_COLUMNS] /= 2
+
+    assert store.append("AAA.JK", "1d", adjusted.iloc[48:]) is None
+    assert_same_bars(store.read("AAA.JK", "1d"), bars.iloc[:50])
+
+
+def test_get_refetches_full_history_after_split(store, make_ohlcv, monkeypatch):
+    bars = make_ohlcv(n=60)
+    store.replace("AAA.JK", "1d", bars.iloc[:50])
+
+    adjusted = bars.copy()
+    adjusted[PRICE_COLUMNS] /= 2
+    calls = []
+
+    def fake_download(ticker, **kwargs):
+        calls.append(kwargs)
+        return adjusted[adjusted.index >= kwargs["start"]]
+
+    monkeypatch.setattr(market_data, "download", fake_download)
+    store.get("AAA.JK", "1mo", "1d")
+
+    assert [call["start"] for call in calls] == [bars.index[48], bars.index[0]]
+    assert_same_bars(store.read("AAA.JK", "1d"), adjusted)
+
+
+def test_max_period_needs_full_history(store, make_ohlcv):
+    bars = make_ohlcv(n=60)
+
+    store.replace("AAA.JK", "1d", bars)
+    assert store.plan("AAA.JK", "max", "1d")[0] == "full"
+
+    store.replace("AAA.JK", "1d", bars, full_history=True)
+    assert store.plan("AAA.JK", "max", "1d")[0] == "incremental"
+
+    # Append tetap mempertahankan penanda riwayat penuh
+    store.append("AAA.JK", "1d", bars.iloc[-2:])
+    assert store.plan("AAA.JK", "max", "1d")[0] == "incremental"
@@ -0,0 +1,117 @@
+import pandas as pd
+import pytest
+import yfinance as yf
+
+import market_data
+from market_data import RateLimiter
+
+
+def make_limiter():
+    return RateLimiter(rate=4.0, burst=8, concurrency=8, base_delay=0.0, max_delay=0.0)
+
+
+def test_empty_response_is_not_throttle():
+    limiter = make_limiter()
+    calls = []
+
+    def delisted():
+        calls.append(1)
+        return pd.DataFrame()
+
+    assert limiter.call(delisted).empty
+    assert len(calls) == 1
+    assert limiter.throttled == 0
+    assert limiter.rate >= 4.0
+    assert limiter.concurrency == 8
+
+
+def test_rate_limit_error_is_retried_and_throttles():
+    limiter = make_limiter()
+    calls = []
+
+    def throttled_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("429 Client Error: Too Many Requests")
+        return {"symbol": "AAA.JK"}
+
+    assert limiter.call(throttled_once) == {"symbol": "AAA.JK"}
+    assert len(calls) == 2
+    assert limiter.throttled == 1
+    assert limiter.concurrency == 4
+
+
+def test_other_errors_are_not_retried():
+    limiter = make_limiter()
+
+    def broken():
+        raise ValueError("no timezone found")
+
+    with pytest.raises(ValueError):
+        limiter.call(broken)
+    assert limiter.throttled == 0
+
+
+# ===========================================
+# yf.download (ERROR 429 PER TICKER TIDAK DILEMPAR)
+# ===========================================
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = make_limiter()
+    monkeypatch.setattr(market_data, "YAHOO_LIMITER", limiter)
+    return limiter
+
+
+def fake_history(monkeypatch, make_ohlcv, failures):
+    """Ticker.history palsu: `failures` panggilan pertama kena YFRateLimitError, lalu OHLCV"""
+    calls = []
+
+    def history(self, *args, **kwargs):
+        calls.append(self.ticker)
+        if len(calls) <= failures:
+            raise yf.exceptions.YFRateLimitError()
+        return make_ohlcv(n=20)
+
+    monkeypatch.setattr(yf.Ticker, "history", history)
+    return calls
+
+
+def test_throttled_download_returning_empty_frame_is_retried(monkeypatch, limiter, make_ohlcv):
+    calls = fake_history(monkeypatch, make_ohlcv, failures=1)
+
+    raw = market_data.download("AAA.JK", period="1mo", threads=False)
+
+    assert not raw.empty
+    assert len(calls) == 2
+    assert limiter.throttled == 1
+
+
+def test_empty_single_ticker_download_is_not_retried(monkeypatch, limiter):
+    calls = []
+
+    def delisted(self, *args, **kwargs):
+        calls.append(self.ticker)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(yf.Ticker, "history", delisted)
+
+    assert market_data.download("AAA.JK", period="1mo", threads=False).empty
+    assert len(calls) == 1
+    assert limiter.throttled == 0
+
+
+def test_empty_batch_is_retried_without_throttling(monkeypatch, limiter, make_ohlcv):
+    calls = []
+
+    def empty_first_round(self, *args, **kwargs):
+        calls.append(self.ticker)
+        return pd.DataFrame() if len(calls) <= 2 else make_ohlcv(n=20)
+
+    monkeypatch.setattr(yf.Ticker, "history", empty_first_round)
+
+    raw = market_data.download(["AAA.JK", "BBB.JK"], period="1mo", group_by="ticker", threads=False)
+
+    assert not raw.empty
+    assert len(calls) == 4
+    assert limiter.throttled == 0
+    assert limiter.rate >= 4.0
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from results_query import ResultsQuery
+from results_store import results_frame
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 200
+    scores = rng.integers(0, 101, n).astype(float)
+    scores[rng.random(n) < 0.1] = np.nan
+    return results_frame({
+        "Kode": [f"T{i:03d}.JK" for i in range(n)],
+        "info_sector": rng.choice(["Energy", "Financial Services", "Technology", None], n),
+        "info_category": rng.choice(["Besar", "Menengah", "Kecil"], n),
+        "fundamental_score": scores,
+        "valuation_score": rng.integers(0, 101, n),
+        "info_marketCap": rng.integers(10**9, 10**13, n),
+    })
+
+
+def mask_positions(df, mask):
+    return np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+
+
+# ===========================================
+# FILTER VS BOOLEAN MASK PANDAS
+# ===========================================
+def test_positions_match_boolean_mask(df):
+    query = ResultsQuery(df)
+
+    positions = query.positions(
+        equals={"info_sector": "Energy", "info_category": "Besar"},
+        ranges={"fundamental_score": (40, 80), "info_marketCap": (None, 5 * 10**12)},
+    )
+    mask = (
+        (df["info_sector"] == "Energy")
+        & (df["info_category"] == "Besar")
+        & df["fundamental_score"].between(40, 80)
+        & (df["info_marketCap"] <= 5 * 10**12)
+    )
+    np.testing.assert_array_equal(positions, mask_positions(df, mask))
+
+    # Tanpa filter → semua baris; nilai yang tidak ada → kosong
+    np.testing.assert_array_equal(query.positions(), np.arange(len(df)))
+    assert len(query.positions(equals={"info_sector": "Mining"})) == 0
+    pd.testing.assert_frame_equal(
+        query.filter(ranges={"valuation_score": (90, None)}),
+        df[df["valuation_score"] >= 90]
+    )
+
+
+def test_cached_positions_are_read_only(df):
+    query = ResultsQuery(df, cache_size=1)
+    first = query.positions(equals={"info_category": "Kecil"})
+
+    assert query.positions(equals={"info_category": "Kecil"}) is first
+    with pytest.raises(ValueError):
+        first[0] = 0
+
+    # Entri lama dibuang setelah melewati cache_size
+    query.positions(equals={"info_category": "Besar"})
+    assert query.positions(equals={"info_category": "Kecil"}) is not first
+
+
+# ===========================================
+# SORT & PAGINATION
+# ===========================================
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sorted_positions_match_sort_values(df, ascending):
+    query = ResultsQuery(df)
+    ranges = {"valuation_score": (20, None)}
+
+    positions = query.sorted_positions(ranges=ranges, sort_by="fundamental_score", ascending=ascending)
+
+    expected = (
+        df[df["valuation_score"] >= 20]
+        .sort_values("fundamental_score", ascending=ascending, kind="stable", na_position="last")
+    )
+    np.testing.assert_array_equal(df.index[positions], expected.index)
+    # Nilai kosong di akhir
+    missing = expected["fundamental_score"].isna().sum()
+    assert missing > 0
+    assert df["fundamental_score"].iloc[positions[-missing:]].isna().all()
+
+
+def test_page_projects_columns(df):
+    query = ResultsQuery(df)
+    positions = query.sorted_positions(sort_by="Kode", ascending=False)
+
+    page = query.page(positions, page=2, page_size=25, columns=["Kode", "fundamental_score"])
+
+    assert list(page.columns) == ["Kode", "fundamental_score"]
+    assert list(page["Kode"]) == list(df["Kode"].sort_values(ascending=False).iloc[25:50])
+    assert query.page(positions, page=9, page_size=25).empty
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from results_store import ResultsStore, load_results
+
+
+OLD_DATE = "2026-01-05"
+NEW_DATE = "2026-01-12"
+
+
+def row(ticker, signal="NO TRADE", fundamental_score=50, **extra):
+    return {
+        "Kode": ticker,
+        "technical_signal": signal,
+        "technical_trend": "SIDEWAYS",
+        "fundamental_score": fundamental_score,
+        "valuation_score": 40,
+        "valuation_notes": ["PER wajar"],
+        **extra,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(root=str(tmp_path))
+    store.write([
+        row("AAAA.JK"),
+        row("BBBB.JK", fundamental_score=80),
+        row("CCCC.JK"),
+    ], date=OLD_DATE)
+    store.write([
+        row("AAAA.JK"),
+        row("BBBB.JK", signal="BUY", fundamental_score=60),
+        row("DDDD.JK"),
+    ], date=NEW_DATE)
+    return store
+
+
+def test_write_keeps_schema_types_and_snapshots(store):
+    assert store.snapshot_dates() == [pd.Timestamp(OLD_DATE), pd.Timestamp(NEW_DATE)]
+
+    latest = load_results(store)
+    assert list(latest["Kode"]) == ["AAAA.JK", "BBBB.JK", "DDDD.JK"]
+    assert str(latest["fundamental_score"].dtype) == "UInt8"
+    assert isinstance(latest["technical_signal"].dtype, pd.CategoricalDtype)
+    assert latest.loc[0, "valuation_notes"] == ["PER wajar"]
+
+
+def test_diff_added_removed_changed(store):
+    changes = store.diff(OLD_DATE, NEW_DATE).set_index("Kode")
+
+    # AAAA.JK sama persis → tidak muncul
+    assert sorted(changes.index) == ["BBBB.JK", "CCCC.JK", "DDDD.JK"]
+    assert changes.loc["DDDD.JK", "status"] == "BARU"
+    assert changes.loc["CCCC.JK", "status"] == "HILANG"
+
+    changed = changes.loc["BBBB.JK"]
+    assert changed["status"] == "BERUBAH"
+    assert changed["changed"] == ["technical_signal", "fundamental_score"]
+    assert changed["technical_signal_old"] == "NO TRADE"
+    assert changed["technical_signal_new"] == "BUY"
+
+
+def test_diff_delta_of_unsigned_scores_is_signed(store):
+    changes = store.diff(OLD_DATE, NEW_DATE).set_index("Kode")
+
+    # UInt8 80 → 60 tidak boleh wrap-around jadi 236
+    assert changes.loc["BBBB.JK", "fundamental_score_delta"] == -20
+    assert pd.isna(changes.loc["DDDD.JK", "fundamental_score_delta"])
+    assert pd.isna(changes.loc["CCCC.JK", "fundamental_score_delta"])
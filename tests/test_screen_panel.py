@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import StockAnalyzer
+from indicators import price_panel, screen_panel
+from market_data import PriceStore
+from pipeline import TECHNICAL_COLUMNS, recompute_technicals
+from results_store import ResultsStore
+
+
+@pytest.fixture
+def frames(make_ohlcv):
+    # Panjang berbeda + satu bar hilang agar baris panel tidak sejajar
+    short = make_ohlcv(seed=12, n=40)
+    return {
+        "AAAA.JK": make_ohlcv(seed=10, n=130),
+        "BBBB.JK": make_ohlcv(seed=11, n=90),
+        "CCCC.JK": short.drop(short.index[20]),
+    }
+
+
+def per_ticker_technical(df):
+    analyzer = StockAnalyzer("TEST.JK", price_data=df, price_store=None)
+    return analyzer.technical_analysis()
+
+
+# ===========================================
+# PANEL VS ANALISIS PER SAHAM
+# ===========================================
+def test_screen_panel_matches_per_ticker_analysis(frames):
+    panel = price_panel(frames)
+    snapshot = screen_panel(panel["Close"], panel["High"], panel["Low"])
+
+    assert list(snapshot.index) == list(frames)
+    for ticker, df in frames.items():
+        expected = per_ticker_technical(df)
+        row = snapshot.loc[ticker]
+
+        assert row["trend"] == expected["trend"]
+        assert row["momentum"] == expected["momentum"]
+        assert row["signal"] == expected["signal"]
+        np.testing.assert_allclose(
+            [row["close"], row["support_1"], row["support_2"], row["resistance_1"], row["resistance_2"]],
+            [expected["close"], *expected["support"], *expected["resistance"]],
+            err_msg=ticker
+        )
+
+
+# ===========================================
+# update --from-store
+# ===========================================
+def test_recompute_technicals_updates_only_technical_columns(tmp_path, frames):
+    price_store = PriceStore(tmp_path / "prices")
+    store = ResultsStore(tmp_path / "results")
+    for ticker, df in frames.items():
+        price_store.write(ticker, "1d", df)
+
+    store.write([
+        {"Kode": ticker, "technical_trend": "SIDEWAYS", "technical_close": 1.0,
+         "fundamental_score": 70, "valuation_conclusion": "WAJAR"}
+        for ticker in frames
+    ] + [{"Kode": "DDDD.JK", "technical_close": 5.0, "fundamental_score": 10}])
+
+    result = recompute_technicals(
+        period="1y", interval="1d", output=None, store=store, price_store=price_store
+    ).set_index("Kode")
+
+    for ticker, df in frames.items():
+        expected = per_ticker_technical(df)
+        assert result.loc[ticker, "technical_trend"] == expected["trend"]
+        assert result.loc[ticker, "technical_close"] == pytest.approx(expected["close"])
+        assert result.loc[ticker, "trading_recommendation"] is not None
+        assert result.loc[ticker, "fundamental_score"] == 70
+
+    # Tanpa harga lokal → tidak berubah
+    assert result.loc["DDDD.JK", "technical_close"] == 5.0
+    assert pd.isna(result.loc["DDDD.JK", "trading_recommendation"])
+
+    # Tipe kolom tetap sesuai skema
+    assert isinstance(result["technical_trend"].dtype, pd.CategoricalDtype)
+    assert set(TECHNICAL_COLUMNS.values()) <= set(store.read().columns)
+
+
+def test_recompute_technicals_without_results(tmp_path):
+    store = ResultsStore(tmp_path / "results")
+    assert recompute_technicals(output=None, store=store, price_store=PriceStore(tmp_path)) is None
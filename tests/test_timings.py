@@ -0,0 +1,34 @@
+import pandas as pd
+
+from market_data import RateLimiter
+from timings import RUN_KEY, StageTimings, payload_size, summarize_timings
+
+
+def test_requests_are_recorded_to_active_stage():
+    limiter = RateLimiter(base_delay=0.0)
+    frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0]})
+    timings = StageTimings()
+
+    with timings.stage("fetch_prices"):
+        limiter.call(lambda: frame)
+    # Di luar tahap tidak dicatat
+    limiter.call(lambda: frame)
+
+    entry = timings.as_dict()["fetch_prices"]
+    assert entry["requests"] == 1
+    assert entry["bytes"] == payload_size(frame) > 0
+    assert entry["wall"] >= entry["network"] >= 0
+
+
+def test_summary_does_not_count_run_key_as_ticker():
+    stage = {"wall": 1.0, "network": 0.5, "wait": 0.0, "requests": 1, "bytes": 10, "rows": 5}
+    timings = {
+        RUN_KEY: {"prefetch": dict(stage)},
+        "AAA.JK": {"fetch_info": dict(stage)},
+        "BBB.JK": {"fetch_info": dict(stage)},
+    }
+
+    summary = summarize_timings(timings)
+    assert summary.loc["fetch_info", "tickers"] == 2
+    assert summary.loc["prefetch", "tickers"] == 0
+    assert summary.loc["prefetch", "rows"] == 5
@@ -0,0 +1,153 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+# ===========================================
+# TIMING PER TAHAP ANALISIS
+# ===========================================
+# wall     : total waktu tahap (detik)
+# network  : waktu di dalam request Yahoo (detik)
+# wait     : waktu antre di rate limiter + backoff (detik)
+# requests : jumlah request Yahoo
+# bytes    : perkiraan ukuran data yang diterima (ukuran di memori, tanpa isi objek)
+# rows     : jumlah baris data yang diproses tahap
+STAGE_FIELDS = ("wall", "network", "wait", "requests", "bytes", "rows")
+
+# Tahap yang sedang berjalan di thread ini (lihat StageTimings.stage)
+_active = threading.local()
+
+
+# Key timing untuk tahap batch multi-ticker (mis. prefetch OHLCV), bukan saham
+RUN_KEY = "*"
+
+
+def payload_size(obj):
+    """
+    Perkiraan murah ukuran respons Yahoo dalam bytes (tanpa serialisasi):
+    DataFrame → memory_usage(deep=False), objek lain → sys.getsizeof.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=False, index=True).sum())
+    return sys.getsizeof(obj)
+
+
+def _active_stage():
+    return getattr(_active, "stage", None)
+
+
+def record_request(seconds, result=None):
+    """Dipanggil RateLimiter.call setiap satu request Yahoo selesai"""
+    entry = _active_stage()
+    if entry is None:
+        return
+    entry["network"] += seconds
+    entry["requests"] += 1
+    entry["bytes"] += payload_size(result)
+
+
+def record_wait(seconds):
+    entry = _active_stage()
+    if entry is not None:
+        entry["wait"] += seconds
+
+
+def record_rows(rows):
+    """Tambahkan jumlah baris yang diproses ke tahap yang sedang berjalan"""
+    entry = _active_stage()
+    if entry is not None:
+        entry["rows"] += int(rows)
+
+
+class StageTimings:
+    """
+    Catatan waktu per tahap untuk satu saham:
+        {tahap: {"wall", "network", "wait", "requests", "bytes", "rows"}}
+
+    Request Yahoo (RateLimiter.call) di thread yang sama otomatis tercatat
+    ke tahap terdalam yang sedang berjalan. Tahap yang dipanggil ulang
+    dijumlahkan.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def entry(self, name):
+        return self.stages.setdefault(name, dict.fromkeys(STAGE_FIELDS, 0))
+
+    @contextmanager
+    def stage(self, name):
+        entry = self.entry(name)
+        previous = _active_stage()
+        _active.stage = entry
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["wall"] += time.perf_counter() - start
+            _active.stage = previous
+
+    def as_dict(self):
+        return {name: dict(entry) for name, entry in self.stages.items()}
+
+    def frame(self):
+        return pd.DataFrame.from_dict(self.stages, orient="index", columns=list(STAGE_FIELDS))
+
+
+def timed(name):
+    """Decorator metode StockAnalyzer: catat waktu ke self.timings[name]"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timings.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ===========================================
+# RINGKASAN SATU KALI UPDATE
+# ===========================================
+def timings_frame(timings):
+    """
+    Tabel panjang dari {ticker: StageTimings.as_dict()}:
+    satu baris per (ticker, tahap) dengan kolom STAGE_FIELDS.
+    """
+    rows = [
+        {"ticker": ticker, "stage": stage, **entry}
+        for ticker, stages in timings.items()
+        for stage, entry in stages.items()
+    ]
+    return pd.DataFrame(rows, columns=["ticker", "stage", *STAGE_FIELDS])
+
+
+def summarize_timings(timings):
+    """
+    Ringkasan per tahap dari {ticker: StageTimings.as_dict()}:
+    jumlah saham, total / rata-rata / maksimum wall time, total network,
+    wait, request, bytes dan baris. Tahap paling lama di atas.
+    """
+    frame = timings_frame(timings)
+    # Tahap batch (RUN_KEY) tidak dihitung sebagai saham
+    frame["stock"] = frame["ticker"].where(frame["ticker"] != RUN_KEY)
+    summary = frame.groupby("stage").agg(
+        tickers=("stock", "nunique"),
+        wall_total=("wall", "sum"),
+        wall_mean=("wall", "mean"),
+        wall_max=("wall", "max"),
+        network_total=("network", "sum"),
+        wait_total=("wait", "sum"),
+        requests=("requests", "sum"),
+        bytes=("bytes", "sum"),
+        rows=("rows", "sum"),
+    )
+    return summary.sort_values("wall_total", ascending=False)
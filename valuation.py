@@ -0,0 +1,173 @@
+# ===========================================
+# IMPORT LIBRARY
+# ===========================================
+import numpy as np
+import pandas as pd
+
+
+# ===========================================
+# INPUT VALUASI DARI TICKER.INFO
+# ===========================================
+DEFAULT_INDUSTRY_PE = 15
+
+VALUATION_COLUMNS = [
+    "pe_ratio", "pb_ratio", "dividend_yield", "ev_ebitda",
+    "peg_ratio", "ps_ratio", "industry_pe", "week_52_position",
+]
+
+
+def info_value(info, key, default=None):
+    """Nilai numerik dari Ticker.info; kosong atau 0 dianggap tidak ada"""
+    value = info.get(key, default)
+    if value is None or value == 0:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def valuation_inputs(info, week_52_position=None):
+    """Rasio valuasi satu saham dari Ticker.info (+ posisi rentang 52 minggu)"""
+    pe_ratio = info_value(info, "trailingPE") or info_value(info, "forwardPE")
+
+    dividend_yield = info_value(info, "dividendYield")
+    if dividend_yield:
+        dividend_yield = dividend_yield * 100  # Convert to percentage
+
+    return {
+        "pe_ratio": pe_ratio,
+        "pb_ratio": info_value(info, "priceToBook"),
+        "dividend_yield": dividend_yield,
+        "ev_ebitda": info_value(info, "enterpriseToEbitda"),
+        "peg_ratio": info_value(info, "pegRatio"),
+        "ps_ratio": info_value(info, "priceToSalesTrailing12Months"),
+        "industry_pe": info_value(info, "industryPE", DEFAULT_INDUSTRY_PE),
+        "week_52_position": week_52_position,
+    }
+
+
+def valuation_table(infos, week_52_position=None):
+    """
+    Tabel input valuasi (index = ticker) dari dict {ticker: Ticker.info}.
+    `week_52_position` opsional: dict/Series {ticker: posisi %}.
+    """
+    positions = week_52_position if week_52_position is not None else {}
+    rows = {
+        ticker: valuation_inputs(info or {}, positions.get(ticker))
+        for ticker, info in infos.items()
+    }
+    table = pd.DataFrame.from_dict(rows, orient="index")
+    return table.reindex(columns=VALUATION_COLUMNS).astype(float)
+
+
+# ===========================================
+# ATURAN SCORE VALUASI
+# ===========================================
+# kolom → daftar tingkat (operator, ambang, poin, catatan), dicek berurutan
+# dan berhenti di tingkat pertama yang cocok (if/elif).
+# - ambang berupa nama kolom dibandingkan per baris (mis. PER industri)
+# - operator None = else; catatan None = tidak ada catatan
+# - baris dengan nilai kosong dilewati
+VALUATION_RULES = {
+    "pe_ratio": [
+        ("<", 10, 20, "✅ PER sangat rendah (murah)"),
+        ("<", 15, 15, "✅ PER rendah"),
+        ("<", "industry_pe", 10, "✅ PER di bawah rata-rata industri"),
+        ("<", 25, 5, "⚠️ PER sedang"),
+        (None, None, 0, "❌ PER tinggi (mahal)"),
+    ],
+    "pb_ratio": [
+        ("<", 1, 20, "✅ Harga di bawah nilai buku (murah)"),
+        ("<", 1.5, 15, "✅ PBV rendah"),
+        ("<", 2, 10, "✅ PBV wajar"),
+        ("<", 3, 5, "⚠️ PBV agak tinggi"),
+        (None, None, 0, "❌ PBV sangat tinggi"),
+    ],
+    "dividend_yield": [
+        (">", 5, 15, "✅ Dividend yield tinggi"),
+        (">", 3, 10, "✅ Dividend yield baik"),
+        (">", 1.5, 5, "⚠️ Dividend yield cukup"),
+    ],
+    "peg_ratio": [
+        ("<", 0.5, 15, "✅ PEG sangat rendah (sangat murah)"),
+        ("<", 1, 10, "✅ PEG rendah (murah)"),
+        ("<", 1.5, 5, "⚠️ PEG wajar"),
+        (None, None, 0, "❌ PEG tinggi (mahal)"),
+    ],
+    "week_52_position": [
+        ("<", 30, 15, "✅ Posisi di bawah 30% rentang 52 minggu (murah)"),
+        ("<", 50, 10, "✅ Posisi di bawah tengah rentang 52 minggu"),
+        (">", 70, 0, "❌ Posisi di atas 70% rentang 52 minggu (mahal)"),
+    ],
+}
+
+# (score minimum, kesimpulan, alasan), dicek dari atas
+CONCLUSION_BANDS = [
+    (60, "SAHAM MURAH 🟢", "Berbagai indikator valuasi menunjukkan harga relatif murah"),
+    (40, "SAHAM WAJAR 🟡", "Harga dalam kisaran wajar berdasarkan valuasi"),
+]
+CONCLUSION_DEFAULT = ("SAHAM MAHAL 🔴", "Berbagai indikator valuasi menunjukkan harga relatif mahal")
+
+MAX_VALUATION_SCORE = 100
+
+_OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def _tier_masks(table, column, tiers):
+    values = table[column].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+
+    masks = []
+    for op, threshold, _, _ in tiers:
+        if op is None:
+            masks.append(present)
+            continue
+        if isinstance(threshold, str):
+            threshold = table[threshold].to_numpy(dtype=float)
+        masks.append(present & _OPERATORS[op](values, threshold))
+    return masks
+
+
+def score_valuation(table, rules=VALUATION_RULES, bands=CONCLUSION_BANDS, default=CONCLUSION_DEFAULT):
+    """
+    Score valuasi seluruh universe sekaligus.
+    Return DataFrame: valuation_score, valuation_conclusion,
+    valuation_reason, valuation_notes (list catatan).
+    """
+    n = len(table)
+    score = np.zeros(n, dtype=np.int64)
+    note_columns = []
+
+    for column, tiers in rules.items():
+        masks = _tier_masks(table, column, tiers)
+        # Indeks tingkat pertama yang cocok, -1 jika tidak ada
+        tier = np.select(masks, np.arange(len(tiers)), default=-1)
+
+        points = np.array([t[2] for t in tiers] + [0])
+        notes = np.array([t[3] for t in tiers] + [None], dtype=object)
+        score += points[tier]
+        note_columns.append(notes[tier])
+
+    score = np.minimum(score, MAX_VALUATION_SCORE)
+
+    conditions = [score >= minimum for minimum, _, _ in bands]
+    conclusion = np.select(conditions, [c for _, c, _ in bands], default=default[0])
+    reason = np.select(conditions, [r for _, _, r in bands], default=default[1])
+
+    notes = [
+        [note for note in row if note is not None]
+        for row in zip(*note_columns)
+    ] if note_columns else [[] for _ in range(n)]
+
+    return pd.DataFrame({
+        "valuation_score": score,
+        "valuation_conclusion": conclusion,
+        "valuation_reason": reason,
+        "valuation_notes": pd.Series(notes, dtype=object).to_numpy(),
+    }, index=table.index)